@@ -1,10 +1,17 @@
 import logging
 import json
+import queue
+import threading
+import time
 from supabase_client import supabase_logger
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Page views are written to Supabase in batches by a background thread
+PAGE_VIEW_FLUSH_INTERVAL = 0.5
+PAGE_VIEW_BATCH_SIZE = 500
+
 class AnalyticsService:
     def __init__(self):
         self.user_sessions = {}
@@ -18,6 +25,9 @@ class AnalyticsService:
         self.supabase_logger = supabase_logger
         self._cache = {}
         self._cache_times = {}
+        self._page_view_queue = queue.Queue()
+        self._page_view_thread = None
+        self._page_view_lock = threading.Lock()
 
     def track_verification_attempt(self, wallet_address: str, success: bool):
         """Track verification attempts for analytics"""
@@ -79,9 +89,39 @@ class AnalyticsService:
 
             self.user_sessions[wallet_address]["pages_visited"].append(page_data)
 
-            # Log to Supabase (with null check)
+            # Log to Supabase in the background (with null check)
             if self.supabase_logger:
-                self.supabase_logger.log_page_view(wallet_address, page, page_data)
+                self._page_view_queue.put_nowait((wallet_address, page, page_data))
+                self._ensure_page_view_writer()
+
+    def _ensure_page_view_writer(self):
+        """Start the page view writer thread on first use"""
+        if self._page_view_thread is not None:
+            return
+        with self._page_view_lock:
+            if self._page_view_thread is None:
+                self._page_view_thread = threading.Thread(
+                    target=self._page_view_writer, name="page-view-writer", daemon=True
+                )
+                self._page_view_thread.start()
+
+    def _page_view_writer(self):
+        """Drain queued page views every PAGE_VIEW_FLUSH_INTERVAL seconds in batches"""
+        while True:
+            # Block for the first view, then collect whatever else arrives
+            # within the flush interval
+            batch = [self._page_view_queue.get()]
+            deadline = time.monotonic() + PAGE_VIEW_FLUSH_INTERVAL
+            try:
+                while len(batch) < PAGE_VIEW_BATCH_SIZE:
+                    batch.append(self._page_view_queue.get(timeout=max(0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+
+            try:
+                self.supabase_logger.log_page_views_bulk(batch)
+            except Exception as e:
+                logger.error(f"❌ Error flushing page views: {e}")
 
     def get_user_analytics(self, wallet_address: str):
         """Get analytics data for a specific user"""
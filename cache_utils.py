@@ -1,8 +1,11 @@
 import time
+import math
+import hashlib
 import logging
 from functools import wraps
 from typing import Any, Dict, Optional, Callable
 import threading
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +71,123 @@ class TTLCache:
             }
 
 
+class LFUTTLCache(TTLCache):
+    """TTLCache bounded to maxsize entries, evicting the least-frequently-used key when full
+
+    Keys are kept in per-count buckets (oldest first within a bucket), so a
+    lookup, insert or eviction is O(1) rather than a scan of every key. New
+    keys start with one use so the entry just cached isn't the next victim.
+    """
+
+    def __init__(self, maxsize: int = 10_000, default_ttl: int = 300):
+        super().__init__(default_ttl)
+        self.maxsize = maxsize
+        self._uses: Dict[str, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min_uses = 0
+
+    def _unlink(self, key: str, uses: int) -> None:
+        """Remove key from its use-count bucket"""
+        bucket = self._buckets.get(uses)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._buckets[uses]
+
+    def _forget(self, key: str) -> None:
+        uses = self._uses.pop(key, None)
+        if uses is not None:
+            self._unlink(key, uses)
+
+    def _touch(self, key: str) -> None:
+        uses = self._uses.get(key, 0)
+        self._unlink(key, uses)
+        if uses == self._min_uses and uses not in self._buckets:
+            self._min_uses = uses + 1
+        self._uses[key] = uses + 1
+        self._buckets.setdefault(uses + 1, OrderedDict())[key] = None
+
+    def _evict(self) -> None:
+        """Drop the least-used key (oldest first among equals)"""
+        while self._buckets:
+            uses = self._min_uses if self._min_uses in self._buckets else min(self._buckets)
+            victim, _ = self._buckets[uses].popitem(last=False)
+            if not self._buckets[uses]:
+                del self._buckets[uses]
+            self._uses.pop(victim, None)
+            if self._cache.pop(victim, None) is not None:
+                return
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = super().get(key)
+            if value is None:
+                self._forget(key)
+            else:
+                self._touch(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        with self._lock:
+            if key not in self._cache:
+                self._forget(key)
+                if len(self._cache) >= self.maxsize:
+                    self._evict()
+                self._uses[key] = 1
+                self._buckets.setdefault(1, OrderedDict())[key] = None
+                self._min_uses = 1
+            super().set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            super().delete(key)
+            self._forget(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._uses.clear()
+            self._buckets.clear()
+            self._min_uses = 0
+
+    def cleanup(self) -> int:
+        with self._lock:
+            removed = super().cleanup()
+            for key in [k for k in self._uses if k not in self._cache]:
+                self._forget(key)
+            return removed
+
+
+class BloomFilter:
+    """Thread-safe Bloom filter for cheap "definitely not seen" membership checks"""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 1e-4):
+        # Optimal bit count m = -n*ln(p)/ln(2)^2 and hash count k = m/n*ln(2)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _positions(self, item: str):
+        """Derive hash_count bit positions from one digest (double hashing)"""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        """Add item to the filter"""
+        positions = self._positions(item)
+        with self._lock:
+            for pos in positions:
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
 blockchain_cache = TTLCache(default_ttl=300)
 supabase_cache = TTLCache(default_ttl=120)
 api_cache = TTLCache(default_ttl=60)
@@ -2,7 +2,7 @@ import logging
 import uuid
 import json
 from datetime import datetime, timedelta, timezone
-from supabase_client import get_supabase_client, safe_supabase_operation
+from supabase_client import get_supabase_client, safe_supabase_operation, EMPTY_RESULT
 from .blockchain import community_stories_blockchain
 from config import COMMUNITY_STORIES_CONFIG
 import asyncio
@@ -32,7 +32,7 @@ class CommunityStoriesService:
                     .select('custom_message')\
                     .eq('feature_name', 'community_stories_config')\
                     .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
+                fallback_result=EMPTY_RESULT,
                 operation_name="get community stories config from DB"
             )
 
@@ -3,7 +3,7 @@ import logging
 import asyncio
 from .community_stories_service import community_stories_service
 from config import COMMUNITY_STORIES_CONFIG
-from supabase_client import get_supabase_client, safe_supabase_operation
+from supabase_client import get_supabase_client, safe_supabase_operation, EMPTY_RESULT
 import os
 import base64
 import requests
@@ -40,7 +40,7 @@ def get_config():
                     .select('custom_message')\
                     .eq('feature_name', 'community_stories_message')\
                     .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
+                fallback_result=EMPTY_RESULT,
                 operation_name="get community stories custom message"
             )
             
@@ -540,7 +540,7 @@ def get_requirement_example_images():
                 .order('reviewed_at', desc=True)\
                 .limit(limit)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get requirement example images"
         )
         
@@ -171,3 +171,32 @@ ALTER TABLE user_task_progress ENABLE ROW LEVEL SECURITY;
 -- Create policies
 CREATE POLICY "Allow all operations on task_completion_log" ON task_completion_log FOR ALL USING (true);
 CREATE POLICY "Allow all operations on user_task_progress" ON user_task_progress FOR ALL USING (true);
+
+-- ====================================
+-- 6. RECENT TASK SUBMISSIONS VIEW
+-- ====================================
+-- Twitter, Telegram and Facebook submissions in one feed so the homepage
+-- can filter, order and limit them in a single query. Each branch is served
+-- by the existing created_at index on its base table.
+CREATE OR REPLACE VIEW v_recent_task_submissions AS
+    SELECT wallet_address, reward_amount, created_at,
+           twitter_url AS submission_url, 'Twitter'::text AS platform,
+           'twitter_post'::text AS submission_type
+    FROM twitter_task_log
+    UNION ALL
+    SELECT wallet_address, reward_amount, created_at,
+           telegram_url AS submission_url, 'Telegram'::text AS platform,
+           'telegram_post'::text AS submission_type
+    FROM telegram_task_log
+    UNION ALL
+    SELECT wallet_address, reward_amount, created_at,
+           facebook_url AS submission_url, 'Facebook'::text AS platform,
+           'facebook_post'::text AS submission_type
+    FROM facebook_task_log;
+
+-- ====================================
+-- 7. MAINTENANCE SETTINGS KEY
+-- ====================================
+-- Settings are written with upsert(on_conflict='feature_name'), which
+-- needs a unique index on the conflict column
+CREATE UNIQUE INDEX IF NOT EXISTS idx_maintenance_settings_feature_name ON maintenance_settings(feature_name);
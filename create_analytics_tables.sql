@@ -31,6 +31,8 @@ CREATE TABLE IF NOT EXISTS user_data (
 -- Create indexes for user_data
 CREATE INDEX IF NOT EXISTS idx_user_data_wallet ON user_data(wallet_address);
 CREATE INDEX IF NOT EXISTS idx_user_data_verified ON user_data(ubi_verified);
+-- Admin user list pages newest first by (created_at, wallet_address) (keyset pagination)
+CREATE INDEX IF NOT EXISTS idx_user_data_created_at ON user_data(created_at DESC, wallet_address DESC);
 
 -- Enable RLS
 ALTER TABLE user_data ENABLE ROW LEVEL SECURITY;
@@ -44,6 +46,17 @@ CREATE TRIGGER update_user_data_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Add a batch of page views to total_page_views in one statement.
+-- p_counts is a JSON object of {wallet_address: views}; the increment runs
+-- in the database so concurrent writers never lose each other's counts.
+CREATE OR REPLACE FUNCTION bump_page_views(p_counts JSONB)
+RETURNS VOID AS $$
+    UPDATE user_data u
+    SET total_page_views = COALESCE(u.total_page_views, 0) + c.value::INTEGER
+    FROM jsonb_each_text(p_counts) AS c
+    WHERE u.wallet_address = c.key;
+$$ LANGUAGE sql;
+
 -- ====================================
 -- 2. USER SESSIONS TABLE
 -- ====================================
@@ -97,6 +110,8 @@ CREATE INDEX IF NOT EXISTS idx_admin_actions_log_admin_wallet ON admin_actions_l
 CREATE INDEX IF NOT EXISTS idx_admin_actions_log_action_type ON admin_actions_log(action_type);
 CREATE INDEX IF NOT EXISTS idx_admin_actions_log_target_wallet ON admin_actions_log(target_wallet);
 CREATE INDEX IF NOT EXISTS idx_admin_actions_log_created_at ON admin_actions_log(created_at);
+-- Admin actions log pages newest first by (created_at, id) (keyset pagination)
+CREATE INDEX IF NOT EXISTS idx_admin_actions_log_created_at_id ON admin_actions_log(created_at DESC, id DESC);
 
 -- Enable RLS
 ALTER TABLE admin_actions_log ENABLE ROW LEVEL SECURITY;
@@ -31,6 +31,8 @@ CREATE INDEX IF NOT EXISTS idx_cs_submissions_status ON community_stories_submis
 CREATE INDEX IF NOT EXISTS idx_cs_submissions_submission_id ON community_stories_submissions(submission_id);
 CREATE INDEX IF NOT EXISTS idx_cs_submissions_submitted_at ON community_stories_submissions(submitted_at);
 CREATE INDEX IF NOT EXISTS idx_cs_submissions_reviewed_at ON community_stories_submissions(reviewed_at);
+-- Approved stories newest first (homepage recent stories feed)
+CREATE INDEX IF NOT EXISTS idx_cs_submissions_approved_reviewed ON community_stories_submissions(reviewed_at DESC) WHERE status IN ('approved_high', 'approved_low');
 
 -- Enable RLS
 ALTER TABLE community_stories_submissions ENABLE ROW LEVEL SECURITY;
@@ -37,6 +37,7 @@ CREATE TABLE IF NOT EXISTS quiz_questions (
 CREATE INDEX IF NOT EXISTS idx_quiz_questions_active ON quiz_questions(active);
 CREATE INDEX IF NOT EXISTS idx_quiz_questions_difficulty ON quiz_questions(difficulty);
 CREATE INDEX IF NOT EXISTS idx_quiz_questions_category ON quiz_questions(category);
+CREATE INDEX IF NOT EXISTS idx_quiz_questions_created_at ON quiz_questions(created_at DESC, question_id DESC);
 
 -- Enable RLS for quiz_questions
 ALTER TABLE quiz_questions ENABLE ROW LEVEL SECURITY;
@@ -50,6 +51,38 @@ CREATE TRIGGER update_quiz_questions_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Random sample of n questions, drawn server-side so callers never
+-- transfer the whole table (used by the minigames quiz)
+CREATE OR REPLACE FUNCTION get_random_quiz(n INTEGER)
+RETURNS TABLE (
+    question_id VARCHAR(50),
+    question TEXT,
+    answer_a TEXT,
+    answer_b TEXT,
+    answer_c TEXT,
+    answer_d TEXT,
+    correct VARCHAR(1)
+) AS $$
+    SELECT q.question_id, q.question, q.answer_a, q.answer_b, q.answer_c, q.answer_d, q.correct
+    FROM quiz_questions q
+    ORDER BY random()
+    LIMIT n;
+$$ LANGUAGE sql VOLATILE;
+
+-- Delete every question and return how many rows were removed, so the
+-- admin "delete all" action takes one round-trip and reports exactly
+-- what was deleted (WHERE true keeps pg_safeupdate happy)
+CREATE OR REPLACE FUNCTION delete_all_quiz_questions_rpc()
+RETURNS INTEGER AS $$
+DECLARE
+    deleted_count INTEGER;
+BEGIN
+    DELETE FROM quiz_questions WHERE true;
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+    RETURN deleted_count;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ====================================
 -- 2. QUIZ SETTINGS TABLE
 -- ====================================
@@ -112,6 +145,8 @@ CREATE INDEX IF NOT EXISTS idx_learnearn_log_wallet ON learnearn_log(wallet_addr
 CREATE INDEX IF NOT EXISTS idx_learnearn_log_quiz_id ON learnearn_log(quiz_id);
 CREATE INDEX IF NOT EXISTS idx_learnearn_log_timestamp ON learnearn_log(timestamp);
 CREATE INDEX IF NOT EXISTS idx_learnearn_log_status ON learnearn_log(status);
+-- Successful rewards in time order (public participants list for a day)
+CREATE INDEX IF NOT EXISTS idx_learnearn_log_active_timestamp ON learnearn_log(timestamp) WHERE status = true;
 
 -- Enable RLS for learnearn_log
 ALTER TABLE learnearn_log ENABLE ROW LEVEL SECURITY;
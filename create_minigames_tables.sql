@@ -70,7 +70,7 @@ CREATE TABLE IF NOT EXISTS minigame_withdrawals_log (
 -- Create indexes for minigame_withdrawals_log
 CREATE INDEX IF NOT EXISTS idx_minigame_withdrawals_wallet ON minigame_withdrawals_log(wallet_address);
 CREATE INDEX IF NOT EXISTS idx_minigame_withdrawals_date ON minigame_withdrawals_log(withdrawal_date);
-CREATE INDEX IF NOT EXISTS idx_minigame_withdrawals_tx_hash ON minigame_withdrawals_log(tx_hash);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_minigame_withdrawals_tx_hash_unique ON minigame_withdrawals_log(tx_hash);
 
 -- Enable RLS for minigame_withdrawals_log
 ALTER TABLE minigame_withdrawals_log ENABLE ROW LEVEL SECURITY;
@@ -190,6 +190,154 @@ ALTER TABLE minigame_rewards_log ENABLE ROW LEVEL SECURITY;
 -- Create policy for minigame_rewards_log
 CREATE POLICY "Allow all operations on minigame_rewards_log" ON minigame_rewards_log FOR ALL USING (true);
 
+-- ====================================
+-- RPC FUNCTIONS
+-- ====================================
+-- Atomically add p_delta to a wallet's available_balance in one round-trip.
+-- With p_create the row is created if missing; otherwise only existing rows
+-- are updated and an empty set is returned when the wallet has no balance.
+CREATE OR REPLACE FUNCTION adjust_balance(
+    p_wallet TEXT,
+    p_delta NUMERIC,
+    p_last_deposit DATE DEFAULT NULL,
+    p_create BOOLEAN DEFAULT TRUE
+)
+RETURNS SETOF minigame_balances AS $$
+BEGIN
+    IF p_create THEN
+        RETURN QUERY
+        INSERT INTO minigame_balances AS b (wallet_address, available_balance, total_withdrawn, last_deposit_date)
+        VALUES (p_wallet, p_delta, 0, p_last_deposit)
+        ON CONFLICT (wallet_address) DO UPDATE
+            SET available_balance = b.available_balance + EXCLUDED.available_balance,
+                last_deposit_date = COALESCE(EXCLUDED.last_deposit_date, b.last_deposit_date),
+                updated_at = NOW()
+        RETURNING b.*;
+    ELSE
+        RETURN QUERY
+        UPDATE minigame_balances AS b
+            SET available_balance = b.available_balance + p_delta,
+                updated_at = NOW()
+            WHERE b.wallet_address = p_wallet
+        RETURNING b.*;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Atomically count one play (and its earnings) in today's daily_game_limits
+-- row, creating it if needed, and return the updated row.
+CREATE OR REPLACE FUNCTION bump_daily_limit(
+    p_wallet TEXT,
+    p_game TEXT,
+    p_game_date DATE,
+    p_earned NUMERIC DEFAULT 0
+)
+RETURNS SETOF daily_game_limits AS $$
+BEGIN
+    RETURN QUERY
+    INSERT INTO daily_game_limits AS d (wallet_address, game_type, game_date, plays_today, earned_today)
+    VALUES (p_wallet, p_game, p_game_date, 1, p_earned)
+    ON CONFLICT (wallet_address, game_type, game_date) DO UPDATE
+        SET plays_today = d.plays_today + 1,
+            earned_today = d.earned_today + EXCLUDED.earned_today
+    RETURNING d.*;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Record a completed game in one transaction: bump today's daily_game_limits
+-- row and credit winnings to an existing balance. new_balance is NULL when the
+-- wallet has no minigame_balances row.
+CREATE OR REPLACE FUNCTION complete_game_tx(
+    p_wallet TEXT,
+    p_game TEXT,
+    p_winnings NUMERIC,
+    p_game_date DATE,
+    p_max_plays INTEGER
+)
+RETURNS TABLE (new_balance NUMERIC, plays_today INTEGER, remaining INTEGER) AS $$
+#variable_conflict use_column
+DECLARE
+    v_balance NUMERIC;
+    v_plays INTEGER;
+BEGIN
+    SELECT d.plays_today INTO v_plays
+    FROM bump_daily_limit(p_wallet, p_game, p_game_date, p_winnings) AS d;
+
+    UPDATE minigame_balances AS b
+        SET available_balance = b.available_balance + p_winnings,
+            updated_at = NOW()
+        WHERE b.wallet_address = p_wallet
+    RETURNING b.available_balance INTO v_balance;
+
+    RETURN QUERY SELECT v_balance, v_plays, GREATEST(0, p_max_plays - v_plays);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Atomically record one play in user_game_stats (insert or increment) and
+-- return the updated row.
+CREATE OR REPLACE FUNCTION bump_user_stats(
+    p_wallet TEXT,
+    p_game TEXT,
+    p_score INTEGER,
+    p_earned NUMERIC DEFAULT 0,
+    p_tokens INTEGER DEFAULT 0
+)
+RETURNS SETOF user_game_stats AS $$
+BEGIN
+    RETURN QUERY
+    INSERT INTO user_game_stats AS s (
+        wallet_address, game_type, total_plays, total_score, highest_score,
+        total_earned, virtual_tokens, last_played
+    )
+    VALUES (p_wallet, p_game, 1, p_score, p_score, p_earned, p_tokens, NOW())
+    ON CONFLICT (wallet_address, game_type) DO UPDATE
+        SET total_plays = s.total_plays + 1,
+            total_score = s.total_score + EXCLUDED.total_score,
+            highest_score = GREATEST(s.highest_score, EXCLUDED.highest_score),
+            total_earned = s.total_earned + EXCLUDED.total_earned,
+            virtual_tokens = s.virtual_tokens + EXCLUDED.virtual_tokens,
+            last_played = EXCLUDED.last_played
+    RETURNING s.*;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Record a completed withdrawal in one transaction: write the withdrawals
+-- log row, debit the withdrawn amount and add it to total_withdrawn.
+-- Idempotent per tx_hash: a retried call neither logs nor debits twice.
+-- Returns the remaining available_balance.
+CREATE OR REPLACE FUNCTION record_withdrawal(
+    p_wallet TEXT,
+    p_amount NUMERIC,
+    p_tx_hash TEXT,
+    p_session_id TEXT,
+    p_withdrawal_date DATE DEFAULT CURRENT_DATE
+)
+RETURNS NUMERIC AS $$
+DECLARE
+    v_balance NUMERIC;
+BEGIN
+    INSERT INTO minigame_withdrawals_log (wallet_address, amount, tx_hash, session_id, withdrawal_date)
+    VALUES (p_wallet, p_amount, p_tx_hash, p_session_id, p_withdrawal_date)
+    ON CONFLICT (tx_hash) DO NOTHING;
+
+    IF NOT FOUND THEN
+        SELECT b.available_balance INTO v_balance
+        FROM minigame_balances AS b
+        WHERE b.wallet_address = p_wallet;
+        RETURN v_balance;
+    END IF;
+
+    UPDATE minigame_balances AS b
+        SET available_balance = b.available_balance - p_amount,
+            total_withdrawn = b.total_withdrawn + p_amount,
+            updated_at = NOW()
+        WHERE b.wallet_address = p_wallet
+    RETURNING b.available_balance INTO v_balance;
+
+    RETURN v_balance;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ====================================
 -- TRIGGERS
 -- ====================================
@@ -290,3 +438,5 @@ CREATE TRIGGER update_minigame_balances_updated_at
 -- 3. Timestamps use TIMESTAMP WITH TIME ZONE for proper timezone handling
 -- 4. DECIMAL(18,8) is used for G$ amounts to match blockchain precision
 -- 5. Auto-update trigger is set on minigame_balances.updated_at
+-- 6. Balance mutations go through adjust_balance() to avoid read-modify-write races
+-- 7. Withdrawals are debited and logged together by record_withdrawal()
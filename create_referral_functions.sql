@@ -0,0 +1,53 @@
+
+-- ====================================
+-- REFERRAL PROGRAM FUNCTIONS
+-- ====================================
+-- Functions used by the referral reward flow in routes.py
+-- Run this in your Supabase SQL Editor after the referral tables exist
+
+-- Finish a referral in one round-trip and one transaction: insert the
+-- referral_rewards_log rows for the payouts that succeeded and set the
+-- referral's final status.
+-- p_rows is a JSON array of {wallet_address, reward_amount, reward_type,
+-- referral_code, tx_hash, created_at} objects (may be empty).
+CREATE OR REPLACE FUNCTION finalize_referral(
+    p_code TEXT,
+    p_referee TEXT,
+    p_status TEXT,
+    p_error TEXT,
+    p_completed_at TIMESTAMP WITH TIME ZONE,
+    p_rows JSONB DEFAULT '[]'::jsonb
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO referral_rewards_log (wallet_address, reward_amount, reward_type, referral_code, tx_hash, created_at)
+    SELECT r.wallet_address, r.reward_amount, r.reward_type, r.referral_code, r.tx_hash, r.created_at
+    FROM jsonb_to_recordset(p_rows) AS r(
+        wallet_address TEXT,
+        reward_amount NUMERIC,
+        reward_type TEXT,
+        referral_code TEXT,
+        tx_hash TEXT,
+        created_at TIMESTAMP WITH TIME ZONE
+    );
+
+    UPDATE referrals
+    SET status = p_status,
+        completed_at = p_completed_at,
+        error_message = p_error
+    WHERE referral_code = p_code
+      AND referee_wallet = p_referee;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Referrals and reward payouts for one code in a single round-trip.
+-- referral_rewards_log has no foreign key to referrals (and a code is
+-- shared by many referrals), so the two sets are aggregated side by side
+-- instead of through a PostgREST embedded select.
+CREATE OR REPLACE FUNCTION get_referral_activity(p_code TEXT)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'referrals', COALESCE((SELECT jsonb_agg(r) FROM referrals r WHERE r.referral_code = p_code), '[]'::jsonb),
+        'rewards', COALESCE((SELECT jsonb_agg(l) FROM referral_rewards_log l WHERE l.referral_code = p_code), '[]'::jsonb)
+    );
+$$ LANGUAGE sql STABLE;
@@ -1,12 +1,16 @@
 import os
-import asyncio
+import time
 import logging
-from datetime import datetime
+import threading
 from web3 import Web3
+from eth_abi import encode
 from eth_account import Account
 
 logger = logging.getLogger(__name__)
 
+# 4-byte ERC20 balanceOf(address) selector, used for raw eth_call balance reads
+_BALANCE_OF_SEL = Web3.keccak(text="balanceOf(address)")[:4]
+
 class LearnBlockchainService:
     """Learn & Earn Smart Contract Disbursement Service
     
@@ -18,32 +22,49 @@ class LearnBlockchainService:
         self.celo_rpc_url = os.getenv('CELO_RPC_URL', 'https://forno.celo.org')
         self.chain_id = int(os.getenv('CHAIN_ID', 42220))
         self.gooddollar_address = os.getenv('GOODDOLLAR_CONTRACT', '0x62B8B11039FcfE5aB0C56E502b1C372A3d2a9c7A')
+        self._gooddollar_checksum = Web3.to_checksum_address(self.gooddollar_address)
         self.contract_address = os.getenv('LEARN_EARN_CONTRACT_ADDRESS')
         self._wallet_key = os.getenv('LEARN_WALLET_PRIVATE_KEY')
 
-        self.w3 = Web3(Web3.HTTPProvider(self.celo_rpc_url))
+        # Web3 client and contract are created lazily by ensure_ready() so that
+        # importing this module does not block on RPC round-trips
+        self.w3 = None
         self.contract = None
         self.owner_account = None
-
-        if self.w3.is_connected():
-            logger.info("Connected to Celo network for Learn & Earn")
-        else:
-            logger.error("Failed to connect to Celo network")
+        self._inited = False
+        # threading.Lock, not asyncio.Lock: each Flask request thread runs
+        # its own event loop, and asyncio primitives are not thread-safe
+        self._init_lock = threading.Lock()
 
         self._initialize()
 
+    async def ensure_ready(self):
+        """Create the Web3 client and contract on first use"""
+        if self._inited:
+            return
+
+        with self._init_lock:
+            if self._inited:
+                return
+
+            self.w3 = Web3(Web3.HTTPProvider(self.celo_rpc_url))
+            try:
+                if self.contract_address:
+                    self.contract = self.w3.eth.contract(
+                        address=Web3.to_checksum_address(self.contract_address),
+                        abi=self._get_contract_abi()
+                    )
+                    logger.info("Learn & Earn Contract loaded: %s...", self.contract_address[:10])
+                else:
+                    logger.warning("Learn & Earn contract not configured")
+            except Exception as e:
+                logger.error("Contract initialization error: %s", type(e).__name__)
+
+            self._inited = True
+
     def _initialize(self):
-        """Initialize contract and wallet"""
+        """Initialize wallet (no network access)"""
         try:
-            if self.contract_address:
-                self.contract = self.w3.eth.contract(
-                    address=Web3.to_checksum_address(self.contract_address),
-                    abi=self._get_contract_abi()
-                )
-                logger.info(f"Learn & Earn Contract loaded: {self.contract_address[:10]}...")
-            else:
-                logger.warning("Learn & Earn contract not configured")
-
             if self._wallet_key:
                 key = self._wallet_key if self._wallet_key.startswith('0x') else '0x' + self._wallet_key
                 self.owner_account = Account.from_key(key)
@@ -52,7 +73,10 @@ class LearnBlockchainService:
                 logger.warning("Learn & Earn wallet not configured")
 
         except Exception as e:
-            logger.error(f"Initialization error: {type(e).__name__}")
+            logger.error("Initialization error: %s", type(e).__name__)
+        finally:
+            # owner_account holds the parsed key; don't keep the raw hex around
+            self._wallet_key = None
 
     @property
     def is_configured(self) -> bool:
@@ -68,62 +92,57 @@ class LearnBlockchainService:
             {"inputs": [], "name": "paused", "outputs": [{"type": "bool"}], "stateMutability": "view", "type": "function"},
         ]
 
-    def _get_erc20_abi(self):
-        """Get ERC20 ABI for balance checks"""
-        return [
-            {"inputs": [{"name": "account", "type": "address"}], "name": "balanceOf", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
-        ]
-
     async def get_contract_balance(self) -> float:
         """Get the G$ balance of the Learn & Earn contract"""
         try:
+            await self.ensure_ready()
             if not self.contract:
                 logger.error("Contract not configured")
                 return 0.0
 
             balance_wei = self.contract.functions.getContractBalance().call()
             balance_g = balance_wei / (10 ** 18)
-            logger.info(f"Contract balance: {balance_g:.2f} G$")
+            logger.info("Contract balance: %.2f G$", balance_g)
             return balance_g
 
         except Exception as e:
-            logger.error(f"Error getting contract balance: {type(e).__name__}")
+            logger.error("Error getting contract balance: %s", type(e).__name__)
             return 0.0
 
     async def get_learn_wallet_balance(self) -> float:
         """Get the G$ balance of the Learn wallet (for legacy compatibility)"""
         try:
+            await self.ensure_ready()
             if self.contract:
                 return await self.get_contract_balance()
 
             if not self.owner_account:
                 return 0.0
 
-            erc20 = self.w3.eth.contract(
-                address=Web3.to_checksum_address(self.gooddollar_address),
-                abi=self._get_erc20_abi()
-            )
-            balance_wei = erc20.functions.balanceOf(self.owner_account.address).call()
-            return balance_wei / (10 ** 18)
+            data = _BALANCE_OF_SEL + encode(["address"], [self.owner_account.address])
+            raw = self.w3.eth.call({"to": self._gooddollar_checksum, "data": data})
+            return int.from_bytes(raw, "big") / (10 ** 18)
 
         except Exception as e:
-            logger.error(f"Error getting balance: {type(e).__name__}")
+            logger.error("Error getting balance: %s", type(e).__name__)
             return 0.0
 
     async def send_g_reward(self, wallet_address: str, amount: float, quiz_result_summary: dict = None) -> dict:
         """Send G$ rewards - uses smart contract"""
         try:
-            quiz_id = f"quiz_{hash(str(quiz_result_summary)) % 1000000}" if quiz_result_summary else f"quiz_{int(datetime.now().timestamp())}"
+            quiz_id = f"quiz_{hash(str(quiz_result_summary)) % 1000000}" if quiz_result_summary else f"quiz_{time.time_ns()}"
             return await self.disburse_quiz_reward(wallet_address, amount, quiz_id)
 
         except Exception as e:
-            logger.error(f"Error sending reward: {type(e).__name__}")
+            logger.error("Error sending reward: %s", type(e).__name__)
             return {"success": False, "error": "Failed to send reward"}
 
     async def disburse_quiz_reward(self, wallet_address: str, amount: float, quiz_id: str) -> dict:
         """Send G$ rewards via smart contract"""
         try:
-            logger.info(f"Quiz reward: {amount} G$ to {wallet_address[:10]}...")
+            logger.info("Quiz reward: %s G$ to %s...", amount, wallet_address[:10])
+
+            await self.ensure_ready()
 
             if not self.contract:
                 return {"success": False, "error": "Reward contract not configured. Please contact support."}
@@ -131,9 +150,6 @@ class LearnBlockchainService:
             if not self.owner_account:
                 return {"success": False, "error": "Reward system not configured. Please contact support."}
 
-            if not self._wallet_key:
-                return {"success": False, "error": "Reward system not configured. Please contact support."}
-
             # Check if contract is paused
             try:
                 is_paused = self.contract.functions.paused().call()
@@ -145,7 +161,7 @@ class LearnBlockchainService:
             # Check contract balance
             balance = await self.get_contract_balance()
             if balance < amount:
-                logger.error(f"Insufficient contract balance: {balance:.2f} G$ < {amount} G$")
+                logger.error("Insufficient contract balance: %.2f G$ < %s G$", balance, amount)
                 return {
                     "success": False,
                     "error": "Rewards pool is currently depleted. Please try again later.",
@@ -179,7 +195,7 @@ class LearnBlockchainService:
                 'nonce': nonce,
             })
 
-            signed_txn = self.w3.eth.account.sign_transaction(txn, self._wallet_key)
+            signed_txn = self.owner_account.sign_transaction(txn)
             
             logger.info("Sending reward transaction...")
             tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
@@ -187,12 +203,12 @@ class LearnBlockchainService:
             if not tx_hash_hex.startswith('0x'):
                 tx_hash_hex = '0x' + tx_hash_hex
 
-            logger.info(f"Transaction sent: {tx_hash_hex}")
+            logger.info("Transaction sent: %s", tx_hash_hex)
 
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
 
             if receipt.status == 1:
-                logger.info(f"Reward sent: {amount} G$ - TX: {tx_hash_hex}")
+                logger.info("Reward sent: %s G$ - TX: %s", amount, tx_hash_hex, extra={"tx": tx_hash_hex, "amount": amount})
                 return {
                     "success": True,
                     "tx_hash": tx_hash_hex,
@@ -202,7 +218,7 @@ class LearnBlockchainService:
                     "block_number": receipt.blockNumber
                 }
             else:
-                logger.error(f"Transaction reverted: {tx_hash_hex}")
+                logger.error("Transaction reverted: %s", tx_hash_hex)
                 return {
                     "success": False,
                     "error": "Transaction failed. Please try again.",
@@ -222,7 +238,7 @@ class LearnBlockchainService:
             else:
                 error_msg = "Failed to process reward. Please try again."
             
-            logger.error(f"Quiz reward error: {type(e).__name__}")
+            logger.error("Quiz reward error: %s", type(e).__name__)
             return {"success": False, "error": error_msg}
 
 
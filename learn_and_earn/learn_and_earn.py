@@ -7,7 +7,7 @@ from functools import wraps
 from flask import Blueprint, request, jsonify, render_template, session
 from .blockchain import learn_blockchain_service
 # Contract integration removed - using direct private key disbursement only
-from supabase_client import get_supabase_client
+from supabase_client import get_supabase_client, EMPTY_RESULT
 import random
 from typing import Dict, Any
 
@@ -1150,7 +1150,7 @@ def start_quiz(current_user):
                         .select('custom_message')\
                         .eq('feature_name', 'learn_earn_insufficient_balance')\
                         .execute(),
-                    fallback_result=type('obj', (object,), {'data': []})(),
+                    fallback_result=EMPTY_RESULT,
                     operation_name="get insufficient balance custom message"
                 )
                 if msg_result.data and len(msg_result.data) > 0:
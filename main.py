@@ -83,8 +83,10 @@ app.config['MAX_CONTENT_LENGTH'] = 8 * 1024 * 1024  # 8MB max file upload (reduc
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000  # Cache static files for 1 year
 
 # Performance optimization for low-resource deployment
-app.config['JSON_SORT_KEYS'] = False  # Reduce JSON processing overhead
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False  # Disable pretty printing for better performance
+# Flask 2.3+ ignores the JSON_SORT_KEYS / JSONIFY_PRETTYPRINT_REGULAR config keys;
+# JSON output is configured on the app's JSON provider instead
+app.json.sort_keys = False  # Skip sorting every response dict's keys
+app.json.compact = True  # No indentation/extra whitespace in API responses
 app.config['TEMPLATES_AUTO_RELOAD'] = False  # Disable template auto-reload in production
 
 # Database connection pooling
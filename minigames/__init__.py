@@ -10,6 +10,12 @@ def init_minigames(app):
         # Register blueprints
         app.register_blueprint(minigames_bp)
         app.register_blueprint(garden_bp)
+
+        # Track RPC reachability in the background instead of probing at import
+        minigames_blockchain.start_health_monitor()
+
+        # Warm the deposit tx-hash Bloom filter off the request path
+        minigames_manager.start_tx_bloom_loader()
         
         return True
     except Exception as e:
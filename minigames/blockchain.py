@@ -1,5 +1,8 @@
 import os
+import time
+import asyncio
 import logging
+import threading
 from web3 import Web3
 from eth_account import Account
 from datetime import datetime, timedelta
@@ -40,13 +43,13 @@ class MinigamesBlockchainService:
             logger.warning("⚠️ GAMES_KEY not configured")
 
 
-        # Initialize Web3
+        # Initialize Web3 (reachability is tracked by the background health loop)
         self.w3 = Web3(Web3.HTTPProvider(self.celo_rpc_url))
 
-        if self.w3.is_connected():
-            logger.info("✅ Connected to Celo network for Minigames")
-        else:
-            logger.error("❌ Failed to connect to Celo network")
+        # RPC providers monitored by _health_loop: {url: {"ok": bool, "latency_ms": float}}
+        self.rpc_urls = [self.celo_rpc_url]
+        self._provider_health = {}
+        self._health_thread = None
 
         # GoodDollar token contract
         self.gooddollar_token = Web3.to_checksum_address(self.gooddollar_contract)
@@ -86,6 +89,44 @@ class MinigamesBlockchainService:
         logger.info(f"   GoodDollar token: {self.gooddollar_token}")
 
 
+    async def _health_loop(self, interval: int = 30):
+        """Ping every configured RPC provider and record its reachability"""
+        clients = {
+            url: self.w3 if url == self.celo_rpc_url else Web3(Web3.HTTPProvider(url))
+            for url in self.rpc_urls
+        }
+        while True:
+            for url, client in clients.items():
+                started = time.monotonic()
+                try:
+                    ok = await asyncio.to_thread(client.is_connected)
+                except Exception:
+                    ok = False
+                latency_ms = round((time.monotonic() - started) * 1000, 1)
+
+                previous = self._provider_health.get(url)
+                if previous is None or previous["ok"] != ok:
+                    if ok:
+                        logger.info(f"✅ Celo RPC reachable: {url} ({latency_ms} ms)")
+                    else:
+                        logger.error(f"❌ Celo RPC unreachable: {url}")
+
+                self._provider_health[url] = {"ok": ok, "latency_ms": latency_ms}
+
+            await asyncio.sleep(interval)
+
+    def start_health_monitor(self):
+        """Start the RPC health loop on a daemon thread (no-op if already running)"""
+        if self._health_thread and self._health_thread.is_alive():
+            return
+
+        self._health_thread = threading.Thread(
+            target=lambda: asyncio.run(self._health_loop()),
+            name="minigames-rpc-health",
+            daemon=True
+        )
+        self._health_thread.start()
+
     def mask_wallet_address(self, wallet_address: str) -> str:
         """Mask wallet address for logging"""
         if not wallet_address or len(wallet_address) < 10:
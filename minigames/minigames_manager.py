@@ -1,17 +1,97 @@
 import os
 import json
+import asyncio
 import logging
 import random
-import uuid
+import time
+import secrets
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date
+from operator import itemgetter
+from typing import NamedTuple
 from supabase_client import get_supabase_client
+from cache_utils import BloomFilter, LFUTTLCache, TTLCache
 from .blockchain import minigames_blockchain
 
 logger = logging.getLogger(__name__)
 
+# Worker pool for fire-and-forget stats/log writes. A thread pool (rather than
+# asyncio tasks) is used because routes run each coroutine on a short-lived
+# event loop that is closed as soon as the response is ready.
+_BG_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='minigames-bg')
+
+class GameCfg(NamedTuple):
+    """Static per-game limits and reward settings"""
+    max_plays_per_day: int
+    min_bet: float
+    max_bet: float
+    base_reward: int
+    min_multiplier: float
+    max_multiplier: float
+    # Instant-reward games only
+    reward_per_dollar: float = 0.0
+    reward_per_correct: float = 0.0
+    stake_amount: float = 0.0
+    reward_multiplier: float = 0.0
+    reward_per_match: float = 0.0
+
+
+# Random pool of quiz_questions rows keyed by difficulty; the table changes
+# rarely, so only the per-call sampling runs on a warm hit
+_quiz_cache = TTLCache(default_ttl=300)
+QUIZ_POOL_SIZE = 100  # Rows drawn server-side per cache fill
+QUIZ_SIZE = 10  # Questions served per quiz
+
+# Second-level copy of _quiz_cache that survives restarts/deploys:
+# {cache_key: {'saved_at': epoch_seconds, 'rows': [...]}}
+QUIZ_DISK_CACHE_PATH = os.getenv(
+    'QUIZ_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'minigames_quiz_cache.json')
+)
+QUIZ_DISK_CACHE_TTL = 600  # seconds
+_QUIZ_OPTIONS = itemgetter('answer_a', 'answer_b', 'answer_c', 'answer_d')
+_QUIZ_LETTER_TO_IDX = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
+
+@dataclass(slots=True)
+class QuizQ:
+    """One served quiz question (Flask's JSON provider serializes it as an object)"""
+    question_number: int
+    question_id: str
+    question: str
+    options: list
+    correct_answer: int  # 0-3 for A-D
+
+
+# Game types whose sessions record a bet amount
+BET_GAMES = frozenset({'crash_game', 'coin_flip'})
+
+# Game configurations
+GAME_CONFIGS: dict[str, GameCfg] = {
+    'crash_game': GameCfg(
+        max_plays_per_day=20,  # Maximum 20 plays per day
+        min_bet=10.0,  # Minimum bet 10 G$
+        max_bet=250.0,  # Maximum bet 250 G$
+        base_reward=4,  # Base reward 4 G$ (max 20 G$ at 5x)
+        min_multiplier=1.20,
+        max_multiplier=5.00  # Maximum 5x crash multiplier
+    )
+}
+
+# Instant-reward calculators: (cfg, score, game_data) -> G$ reward
+REWARD_FNS = {
+    'catch_dollar': lambda cfg, score, data: score * cfg.reward_per_dollar,
+    'quiz_trivia': lambda cfg, score, data: score * cfg.reward_per_correct,
+    'battles': lambda cfg, score, data: cfg.stake_amount * cfg.reward_multiplier if data.get('won') else 0,
+    'memory_card': lambda cfg, score, data: data.get('matches', 0) * cfg.reward_per_match,
+    'spin_wheel': lambda cfg, score, data: score,  # Score is the reward itself
+}
+
 class MinigamesManager:
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self._supabase = get_supabase_client()
         self.blockchain_service = minigames_blockchain
 
         # Deposit configurations
@@ -22,37 +102,125 @@ class MinigamesManager:
         self.MIN_WITHDRAWAL = 100.0  # Minimum withdrawal 100 G$
         self.MAX_WITHDRAWAL = 10000.0  # Maximum withdrawal 10,000 G$
 
-        # Game configurations
-        self.game_configs = {
-            'crash_game': {
-                'max_plays_per_day': 20,  # Maximum 20 plays per day
-                'min_bet': 10.0,  # Minimum bet 10 G$
-                'max_bet': 250.0,  # Maximum bet 250 G$
-                'base_reward': 4,  # Base reward 4 G$ (max 20 G$ at 5x)
-                'min_multiplier': 1.20,
-                'max_multiplier': 5.00  # Maximum 5x crash multiplier
-            }
-        }
+        # Per-wallet balance cache: {wallet: (monotonic_ts, balance_dict)}
+        # Invalidated on every balance write from this process
+        self._bal_cache: dict[str, tuple[float, dict]] = {}
+        self.BALANCE_CACHE_TTL = 30  # seconds
+
+        # In-process daily play counters:
+        # {(wallet, game_type, date_iso): (plays_today, monotonic_ts)}
+        # Bumped when a game starts and refreshed by the completion writes.
+        # Other workers' plays are only seen in the DB, so entries are re-read
+        # once stale and always when the wallet is close to its limit
+        self._plays_today: dict[tuple[str, str, str], tuple[int, float]] = {}
+        self._plays_date = None
+        self.PLAYS_CACHE_TTL = 30  # seconds
+        self.PLAYS_RECHECK_REMAINING = 3  # re-read the DB at or below this many plays left
+
+        # Pending background writes (kept referenced until done)
+        self._bg_tasks = set()
+
+        # Per-wallet LRU of recently recorded deposit tx hashes
+        self._recent_tx: dict[str, OrderedDict[str, None]] = {}
+        self.RECENT_TX_CAPACITY = 1000
+
+        # Recorded deposit tx hashes; only "maybe seen" hashes need a DB check.
+        # Warmed on a background thread at startup and then fed by this
+        # process's own inserts, so a miss is a hint, not proof: rows another
+        # worker recorded are caught by the upsert's tx_hash conflict handling
+        self._tx_bloom = BloomFilter(capacity=100_000, error_rate=1e-4)
+        self._tx_bloom_loaded = False
+        self._tx_bloom_thread = None
+
+        # Per-wallet user_game_stats results, dropped whenever stats are written
+        # LFU-bounded so frequently viewed wallets stay cached
+        self._stats_cache = LFUTTLCache(maxsize=10_000, default_ttl=20)
+
+        # Stats fetches started when a wallet opens the minigames dashboard,
+        # awaited by the first get_user_stats call: {wallet: (Future, monotonic_ts)}
+        # Entries older than the stats cache TTL are never served
+        self._prefetch_futures: dict[str, tuple[Future, float]] = {}
+        self.PREFETCH_WAIT = 5  # seconds
+        self.prefetch_stats = {'hits': 0, 'misses': 0, 'wasted': 0}
+        self.coalesced_reads = 0  # Callers served by another caller's in-flight query
+
+        # In-flight reads shared by concurrent identical callers: {key: Future}
+        self._inflight: dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        self._prime_quiz_cache_from_disk()
 
         logger.info("🎮 Minigames Manager initialized")
 
+    @property
+    def supabase(self):
+        """Shared process-wide Supabase client (one keep-alive HTTP session)
+
+        Resolved lazily so the manager picks the client up even if Supabase
+        was unreachable when this module was imported.
+        """
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    def _run_in_background(self, fn, *args, **kwargs):
+        """Run a non-critical DB write off the request path"""
+        future = _BG_EXECUTOR.submit(fn, *args, **kwargs)
+        self._bg_tasks.add(future)
+        future.add_done_callback(self._bg_task_done)
+        return future
+
+    def _bg_task_done(self, future):
+        self._bg_tasks.discard(future)
+        error = future.exception()
+        if error:
+            logger.error(f"❌ Background minigames write failed: {error}")
+
+    def _single_flight(self, key: tuple, fn, *args):
+        """Run fn(*args) once for all concurrent callers with the same key"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            self.coalesced_reads += 1
+            return future.result()
+
+        try:
+            result = fn(*args)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _cached_balance(self, wallet_address: str):
+        """Return the cached balance for a wallet if still fresh, else None"""
+        entry = self._bal_cache.get(wallet_address)
+        if entry and time.monotonic() - entry[0] < self.BALANCE_CACHE_TTL:
+            return entry[1]
+        return None
+
+    def _invalidate_balance(self, wallet_address: str):
+        """Drop the cached balance after a write"""
+        self._bal_cache.pop(wallet_address, None)
+
     def get_deposit_balance(self, wallet_address: str) -> dict:
-        # Use 30-second cache for balance (shorter because it changes frequently)
-        cache_key = f'minigame_balance_{wallet_address}'
-        if hasattr(self, '_cache'):
-            if cache_key in self._cache:
-                cached_data, cached_time = self._cache[cache_key]
-                import time
-                if time.time() - cached_time < 30:  # 30 seconds
-                    logger.info(f"📦 Using cached minigame balance for {wallet_address[:8]}...")
-                    return cached_data
-        else:
-            self._cache = {}
+        cached = self._cached_balance(wallet_address)
+        if cached is not None:
+            logger.info(f"📦 Using cached minigame balance for {wallet_address[:8]}...")
+            return cached
 
         try:
             # Get user's game balance record
             balance_result = self.supabase.table('minigame_balances')\
-                .select('*')\
+                .select('available_balance,total_withdrawn,last_deposit_date')\
                 .eq('wallet_address', wallet_address)\
                 .execute()
 
@@ -75,8 +243,7 @@ class MinigamesManager:
                 }
 
             # Cache the result
-            import time
-            self._cache[cache_key] = (result, time.time())
+            self._bal_cache[wallet_address] = (time.monotonic(), result)
 
             return result
 
@@ -85,11 +252,81 @@ class MinigamesManager:
             error_result = {'success': False, 'error': str(e)}
 
             # Cache error too
-            import time
-            self._cache[cache_key] = (error_result, time.time())
+            self._bal_cache[wallet_address] = (time.monotonic(), error_result)
 
             return error_result
 
+    def _adjust_balance(self, wallet_address: str, delta: float, last_deposit_date: str = None, create: bool = True):
+        """Atomically add delta to available_balance via the adjust_balance RPC
+
+        Returns the updated minigame_balances row, or None when create is False
+        and the wallet has no balance record.
+        """
+        result = self.supabase.rpc('adjust_balance', {
+            'p_wallet': wallet_address,
+            'p_delta': delta,
+            'p_last_deposit': last_deposit_date,
+            'p_create': create
+        }).execute()
+
+        # Clear balance cache to force refresh
+        self._invalidate_balance(wallet_address)
+
+        return result.data[0] if result.data else None
+
+    def _seen(self, wallet_address: str, tx_hash: str) -> bool:
+        """Check the in-memory LRU for a recorded deposit tx hash"""
+        recent = self._recent_tx.get(wallet_address)
+        if recent is not None and tx_hash in recent:
+            recent.move_to_end(tx_hash)
+            return True
+        return False
+
+    def _remember_tx(self, wallet_address: str, tx_hash: str):
+        """Add a recorded deposit tx hash to the wallet's bounded LRU"""
+        recent = self._recent_tx.setdefault(wallet_address, OrderedDict())
+        recent[tx_hash] = None
+        recent.move_to_end(tx_hash)
+        if len(recent) > self.RECENT_TX_CAPACITY:
+            recent.popitem(last=False)
+
+    def start_tx_bloom_loader(self):
+        """Warm the deposit Bloom filter on a daemon thread (no-op if already started)"""
+        if self._tx_bloom_loaded or (self._tx_bloom_thread and self._tx_bloom_thread.is_alive()):
+            return
+
+        self._tx_bloom_thread = threading.Thread(
+            target=self._load_tx_bloom,
+            name="minigames-tx-bloom",
+            daemon=True
+        )
+        self._tx_bloom_thread.start()
+
+    def _load_tx_bloom(self):
+        """Fill the deposit Bloom filter from minigame_deposits_log"""
+        try:
+            # Keyset pages on the unique tx_hash index: a stable order, so no
+            # hash is skipped or repeated between pages
+            page_size = 1000
+            last_hash = None
+            while True:
+                query = self.supabase.table('minigame_deposits_log').select('tx_hash')
+                if last_hash is not None:
+                    query = query.gt('tx_hash', last_hash)
+                page = query.order('tx_hash').limit(page_size).execute()
+                rows = page.data or []
+                for row in rows:
+                    self._tx_bloom.add(row['tx_hash'])
+                if len(rows) < page_size:
+                    break
+                last_hash = rows[-1]['tx_hash']
+
+            self._tx_bloom_loaded = True
+            logger.info(f"🌸 Loaded {self._tx_bloom.count} deposit tx hashes into Bloom filter")
+
+        except Exception as e:
+            logger.error(f"❌ Error loading deposit Bloom filter: {e}")
+
     async def auto_verify_pending_deposits(self, wallet_address: str) -> dict:
         """
         Automatically verify pending deposits for a wallet
@@ -100,7 +337,7 @@ class MinigamesManager:
 
             # Get user's current balance
             balance_info = self.get_deposit_balance(wallet_address)
-            today = date.today().isoformat()
+            today_iso = date.today().isoformat()
 
             # Check blockchain for deposits
             deposits_result = await self.blockchain_service.check_pending_deposits(wallet_address)
@@ -117,76 +354,87 @@ class MinigamesManager:
                     'message': 'No pending deposits found'
                 }
 
-            # Get already recorded deposits
-            recorded_deposits = self.supabase.table('minigame_deposits_log')\
-                .select('tx_hash')\
-                .eq('wallet_address', wallet_address)\
-                .execute()
+            # Get already recorded deposits: in-memory LRU first, then the DB for
+            # hashes the Bloom filter says may have been seen before (every
+            # remaining hash while the filter is still warming up)
+            recorded_tx_hashes = {
+                d['tx_hash'] for d in deposits_found if self._seen(wallet_address, d['tx_hash'])
+            }
+            maybe_recorded = [
+                d['tx_hash'] for d in deposits_found
+                if d['tx_hash'] not in recorded_tx_hashes
+                and (not self._tx_bloom_loaded or d['tx_hash'] in self._tx_bloom)
+            ]
+
+            if maybe_recorded:
+                # tx_hash is globally unique, so only look up the candidates
+                recorded_deposits = self.supabase.table('minigame_deposits_log')\
+                    .select('tx_hash')\
+                    .in_('tx_hash', maybe_recorded)\
+                    .execute()
 
-            recorded_tx_hashes = [d['tx_hash'] for d in (recorded_deposits.data or [])]
+                for d in (recorded_deposits.data or []):
+                    recorded_tx_hashes.add(d['tx_hash'])
+                    self._tx_bloom.add(d['tx_hash'])
+                    self._remember_tx(wallet_address, d['tx_hash'])
+
+            # Pre-filter new, in-bounds deposits, then record them in one batch
+            new_deposits = [
+                d for d in deposits_found
+                if d['tx_hash'] not in recorded_tx_hashes
+                and self.MIN_DEPOSIT <= d['amount'] <= self.MAX_DEPOSIT
+            ]
+            total_new_amount = sum(d['amount'] for d in new_deposits)
+
+            if len(new_deposits) < len(deposits_found):
+                for deposit in deposits_found:
+                    if deposit['tx_hash'] in recorded_tx_hashes:
+                        logger.info(f"⏭️ Skipping already recorded deposit: {deposit['tx_hash'][:16]}...")
+                    elif not self.MIN_DEPOSIT <= deposit['amount'] <= self.MAX_DEPOSIT:
+                        logger.warning(f"⚠️ Deposit {deposit['tx_hash'][:16]}... amount {deposit['amount']} G$ out of bounds, skipping")
+
+            deposit_rows = [
+                {
+                    'wallet_address': wallet_address,
+                    'amount': d['amount'],
+                    'tx_hash': d['tx_hash'],
+                    'deposit_date': today_iso
+                }
+                for d in new_deposits
+            ]
 
-            # Process new deposits
             verified_count = 0
-            total_new_amount = 0
-
-            for deposit in deposits_found:
-                tx_hash = deposit['tx_hash']
-                amount = deposit['amount']
-
-                # Skip if already recorded
-                if tx_hash in recorded_tx_hashes:
-                    logger.info(f"⏭️ Skipping already recorded deposit: {tx_hash[:16]}...")
-                    continue
-
-                # Check amount is within bounds
-                if amount < self.MIN_DEPOSIT or amount > self.MAX_DEPOSIT:
-                    logger.warning(f"⚠️ Deposit {tx_hash[:16]}... amount {amount} G$ out of bounds, skipping")
-                    continue
 
-                # Record the deposit
+            if deposit_rows:
+                # Record the deposits
                 try:
-                    # Update or create balance record - add directly to available_balance
-                    existing = self.supabase.table('minigame_balances')\
-                        .select('*')\
-                        .eq('wallet_address', wallet_address)\
+                    # Log first: the unique tx_hash constraint guards against double credit.
+                    # Rows another request already recorded are skipped, not fatal, and
+                    # only the rows actually inserted come back
+                    inserted = self.supabase.table('minigame_deposits_log')\
+                        .upsert(deposit_rows, on_conflict='tx_hash', ignore_duplicates=True)\
                         .execute()
-
-                    if existing.data:
-                        current = existing.data[0]
-                        new_balance = current.get('available_balance', 0) + amount
-
-                        self.supabase.table('minigame_balances')\
-                            .update({
-                                'available_balance': new_balance,
-                                'last_deposit_date': today,
-                                'updated_at': datetime.now().isoformat()
-                            })\
-                            .eq('wallet_address', wallet_address)\
-                            .execute()
-                    else:
-                        self.supabase.table('minigame_balances').insert({
-                            'wallet_address': wallet_address,
-                            'available_balance': amount,
-                            'total_withdrawn': 0,
-                            'last_deposit_date': today,
-                            'created_at': datetime.now().isoformat()
-                        }).execute()
-
-                    # Log the deposit
-                    self.supabase.table('minigame_deposits_log').insert({
-                        'wallet_address': wallet_address,
-                        'amount': amount,
-                        'tx_hash': tx_hash,
-                        'deposit_date': today
-                    }).execute()
-
-                    verified_count += 1
-                    total_new_amount += amount
-                    logger.info(f"✅ Auto-verified deposit: {amount} G$ (TX: {tx_hash[:16]}...)")
+                    inserted_rows = inserted.data or []
+                    total_new_amount = sum(float(row['amount']) for row in inserted_rows)
+
+                    # Single balance update for the summed amount
+                    if inserted_rows:
+                        self._adjust_balance(wallet_address, total_new_amount, last_deposit_date=today_iso)
+
+                    verified_count = len(inserted_rows)
+                    inserted_hashes = {row['tx_hash'] for row in inserted_rows}
+                    for row in deposit_rows:
+                        # Learn every hash, including ones another worker recorded
+                        self._tx_bloom.add(row['tx_hash'])
+                        self._remember_tx(wallet_address, row['tx_hash'])
+                        if row['tx_hash'] in inserted_hashes:
+                            logger.info(f"✅ Auto-verified deposit: {row['amount']} G$ (TX: {row['tx_hash'][:16]}...)")
+                        else:
+                            logger.info(f"⏭️ Skipping already recorded deposit: {row['tx_hash'][:16]}...")
 
                 except Exception as record_error:
-                    logger.error(f"❌ Error recording deposit {tx_hash[:16]}...: {record_error}")
-                    continue
+                    logger.error(f"❌ Error recording {len(deposit_rows)} deposit(s): {record_error}")
+                    total_new_amount = 0
 
             return {
                 'success': True,
@@ -199,28 +447,54 @@ class MinigamesManager:
             logger.error(f"❌ Error auto-verifying deposits: {e}")
             return {'success': False, 'error': str(e), 'deposits_verified': 0}
 
+    def _prune_plays_today(self, today_iso: str):
+        """Drop play counters left over from previous days"""
+        if self._plays_date != today_iso:
+            self._plays_today = {k: v for k, v in self._plays_today.items() if k[2] == today_iso}
+            self._plays_date = today_iso
+
+    def _record_plays_today(self, wallet_address: str, game_type: str, today_iso: str, plays_today):
+        """Store the authoritative plays_today returned by a daily-limit write"""
+        if plays_today is not None:
+            self._plays_today[(wallet_address, game_type, today_iso)] = (plays_today, time.monotonic())
+
+    def _count_play_started(self, wallet_address: str, game_type: str):
+        """Count a started game against the in-memory daily counter"""
+        key = (wallet_address, game_type, date.today().isoformat())
+        entry = self._plays_today.get(key)
+        if entry is not None:
+            self._plays_today[key] = (entry[0] + 1, entry[1])
+
     def check_daily_limit(self, wallet_address: str, game_type: str) -> dict:
         """Check if user can play the game today"""
         try:
-            today = date.today()
-
-            limit_check = self.supabase.table('daily_game_limits')\
-                .select('*')\
-                .eq('wallet_address', wallet_address)\
-                .eq('game_type', game_type)\
-                .eq('game_date', today.isoformat())\
-                .execute()
+            today_iso = date.today().isoformat()
+            self._prune_plays_today(today_iso)
+            key = (wallet_address, game_type, today_iso)
+            max_plays = GAME_CONFIGS[game_type].max_plays_per_day
+
+            entry = self._plays_today.get(key)
+            fresh = entry is not None and time.monotonic() - entry[1] < self.PLAYS_CACHE_TTL
+            if fresh and max_plays - entry[0] > self.PLAYS_RECHECK_REMAINING:
+                plays_today = entry[0]
+            else:
+                limit_check = self.supabase.table('daily_game_limits')\
+                    .select('plays_today')\
+                    .eq('wallet_address', wallet_address)\
+                    .eq('game_type', game_type)\
+                    .eq('game_date', today_iso)\
+                    .execute()
 
-            max_plays = self.game_configs[game_type]['max_plays_per_day']
+                plays_today = limit_check.data[0]['plays_today'] if limit_check.data else 0
+                if fresh:
+                    # Keep games started here that haven't been written yet
+                    plays_today = max(plays_today, entry[0])
+                    self._plays_today[key] = (plays_today, entry[1])
+                else:
+                    self._plays_today[key] = (plays_today, time.monotonic())
 
-            if limit_check.data:
-                plays_today = limit_check.data[0]['plays_today']
-                can_play = plays_today < max_plays
-                remaining = max(0, max_plays - plays_today)
-            else:
-                can_play = True
-                plays_today = 0
-                remaining = max_plays
+            can_play = plays_today < max_plays
+            remaining = max(0, max_plays - plays_today)
 
             return {
                 'can_play': can_play,
@@ -236,7 +510,7 @@ class MinigamesManager:
     def start_game_session(self, wallet_address: str, game_type: str, bet_amount: float = 0) -> dict:
         """Start a new game session"""
         try:
-            # Check daily limit
+            # Check daily limit (served from memory while fresh and not near the limit)
             limit_check = self.check_daily_limit(wallet_address, game_type)
 
             if not limit_check['can_play']:
@@ -249,20 +523,21 @@ class MinigamesManager:
             if game_type == 'crash_game':
                 # Game is free, no balance checking or deduction
                 bet_amount = 0
-                logger.info(f"🎮 Starting FREE crash game for {wallet_address[:8]}...")
+                logger.debug("🎮 Starting FREE crash game for %s...", wallet_address[:8])
 
-            session_id = f"GAME-{uuid.uuid4().hex[:8].upper()}"
+            session_id = f"GAME-{secrets.token_hex(4).upper()}"
 
             session_data = {
                 'session_id': session_id,
                 'wallet_address': wallet_address,
                 'game_type': game_type,
                 'status': 'in_progress',
-                'bet_amount': bet_amount if (game_type == 'crash_game' or game_type == 'coin_flip') else 0,
+                'bet_amount': bet_amount if game_type in BET_GAMES else 0,
                 'started_at': datetime.now().isoformat()
             }
 
             self.supabase.table('minigame_sessions').insert(session_data).execute()
+            self._count_play_started(wallet_address, game_type)
 
             logger.info(f"🎮 Started {game_type} session {session_id} for {wallet_address[:8]}... (bet: {bet_amount} G$)")
 
@@ -271,7 +546,7 @@ class MinigamesManager:
                 'session_id': session_id,
                 'game_type': game_type,
                 'bet_amount': bet_amount,
-                'config': self.game_configs[game_type]
+                'config': GAME_CONFIGS[game_type]._asdict()
             }
 
         except Exception as e:
@@ -281,9 +556,12 @@ class MinigamesManager:
     async def complete_game_session(self, session_id: str, score: int, game_data: dict = None) -> dict:
         """Complete a game session and calculate rewards"""
         try:
+            now_iso = datetime.now().isoformat()
+            today_iso = date.today().isoformat()
+
             # Get session
             session = self.supabase.table('minigame_sessions')\
-                .select('*')\
+                .select('wallet_address,game_type,bet_amount')\
                 .eq('session_id', session_id)\
                 .execute()
 
@@ -294,6 +572,9 @@ class MinigamesManager:
             wallet_address = session_info['wallet_address']
             game_type = session_info['game_type']
 
+            # Stats from before this game (cached or prefetched) are now out of date
+            self.invalidate_stats(wallet_address)
+
             # For crash_game, calculate winnings using tier-based reward system
             if game_type == 'crash_game':
                 bet_amount = session_info.get('bet_amount', 0)
@@ -333,50 +614,36 @@ class MinigamesManager:
                         'g_dollar_earned': winnings,
                         'game_data': game_data or {},
                         'status': 'completed',
-                        'completed_at': datetime.now().isoformat()
+                        'completed_at': now_iso
                     })\
                     .eq('session_id', session_id)\
                     .execute()
 
-                # Update daily limits
-                self._update_daily_limits(wallet_address, game_type, winnings)
-
-                # Add winnings to available balance
-                balance_result = self.supabase.table('minigame_balances')\
-                    .select('*')\
-                    .eq('wallet_address', wallet_address)\
-                    .execute()
+                # Update daily limits and add winnings to available balance
+                # (existing balances only) in a single transaction
+                tx_result = self.supabase.rpc('complete_game_tx', {
+                    'p_wallet': wallet_address,
+                    'p_game': game_type,
+                    'p_winnings': winnings,
+                    'p_game_date': today_iso,
+                    'p_max_plays': GAME_CONFIGS[game_type].max_plays_per_day
+                }).execute()
+                self._invalidate_balance(wallet_address)
 
-                if balance_result.data:
-                    current_balance = balance_result.data[0]
-                    old_balance = current_balance.get('available_balance', 0)
-                    new_balance = old_balance + winnings
-
-                    logger.info(f"💰 BALANCE UPDATE for {wallet_address[:8]}...")
-                    logger.info(f"   Bet amount: {bet_amount} G$ (already deducted)")
-                    logger.info(f"   Winnings to add: {winnings} G$")
-                    logger.info(f"   Old balance: {old_balance} G$")
-                    logger.info(f"   New balance: {new_balance} G$")
-                    logger.info(f"   Net change: {winnings} G$")
-
-                    self.supabase.table('minigame_balances')\
-                        .update({
-                            'available_balance': new_balance,
-                            'updated_at': datetime.now().isoformat()
-                        })\
-                        .eq('wallet_address', wallet_address)\
-                        .execute()
+                tx_row = tx_result.data[0] if tx_result.data else {}
+                self._record_plays_today(wallet_address, game_type, today_iso, tx_row.get('plays_today'))
 
-                    # Clear balance cache to force refresh
-                    cache_key = f'minigame_balance_{wallet_address}'
-                    if hasattr(self, '_cache') and cache_key in self._cache:
-                        del self._cache[cache_key]
+                if tx_row.get('new_balance') is not None:
+                    new_balance = float(tx_row['new_balance'])
 
-                    logger.info(f"✅ Game complete: {wallet_address[:8]}... won {winnings} G$")
-                    logger.info(f"💰 New available balance: {new_balance} G$")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("💰 BALANCE UPDATE for %s...", wallet_address[:8])
+                        logger.debug("   Bet amount: %s G$ (already deducted)", bet_amount)
+                        logger.debug("   Winnings to add: %s G$", winnings)
+                        logger.debug("   Old balance: %s G$", new_balance - winnings)
+                        logger.debug("   New balance: %s G$", new_balance)
 
-                    # Get updated limit info
-                    limit_info = self.check_daily_limit(wallet_address, game_type)
+                    logger.info("✅ Game complete: %s... won %s G$ (balance: %s G$)", wallet_address[:8], winnings, new_balance)
 
                     return {
                         'success': True,
@@ -384,8 +651,8 @@ class MinigamesManager:
                         'winnings': winnings,
                         'available_balance': new_balance,
                         'can_withdraw': new_balance >= self.MIN_WITHDRAWAL,
-                        'remaining_plays': limit_info.get('remaining_plays', 0),
-                        'plays_today': limit_info.get('plays_today', 0),
+                        'remaining_plays': tx_row.get('remaining', 0),
+                        'plays_today': tx_row.get('plays_today', 0),
                         'message': f'Won {winnings} G$! Total balance: {new_balance} G$'
                     }
                 else:
@@ -405,16 +672,14 @@ class MinigamesManager:
                         'g_dollar_earned': reward_amount,
                         'game_data': game_data or {},
                         'status': 'completed',
-                        'completed_at': datetime.now().isoformat()
+                        'completed_at': now_iso
                     })\
                     .eq('session_id', session_id)\
                     .execute()
 
-                # Update daily limits
-                self._update_daily_limits(wallet_address, game_type, reward_amount)
-
-                # Update user stats
-                self._update_user_stats(wallet_address, game_type, score, reward_amount)
+                # Update daily limits and user stats in the background
+                self._run_in_background(self._update_daily_limits, wallet_address, game_type, reward_amount)
+                self._run_in_background(self._update_user_stats, wallet_address, game_type, score, reward_amount)
 
                 # Disburse reward
                 if reward_amount > 0:
@@ -423,15 +688,16 @@ class MinigamesManager:
                     )
 
                     if disburse_result['success']:
-                        # Log reward
-                        self.supabase.table('minigame_rewards_log').insert({
+                        # Log reward in the background
+                        reward_log = self.supabase.table('minigame_rewards_log').insert({
                             'transaction_hash': disburse_result['tx_hash'],
                             'wallet_address': wallet_address,
                             'game_type': game_type,
                             'session_id': session_id,
                             'reward_amount': reward_amount,
                             'score': score
-                        }).execute()
+                        })
+                        self._run_in_background(reward_log.execute)
 
                         return {
                             'success': True,
@@ -459,92 +725,83 @@ class MinigamesManager:
 
     def _calculate_reward(self, game_type: str, score: int, game_data: dict = None) -> float:
         """Calculate reward based on game type and score"""
-        config = self.game_configs[game_type]
-
-        if game_type == 'catch_dollar':
-            return score * config['reward_per_dollar']
-
-        elif game_type == 'quiz_trivia':
-            return score * config['reward_per_correct']
-
-        elif game_type == 'battles':
-            if game_data and game_data.get('won'):
-                return config['stake_amount'] * config['reward_multiplier']
+        reward_fn = REWARD_FNS.get(game_type)
+        if reward_fn is None:
             return 0
 
-        elif game_type == 'memory_card':
-            matches = game_data.get('matches', 0) if game_data else 0
-            return matches * config['reward_per_match']
-
-        elif game_type == 'spin_wheel':
-            return score  # Score is the reward itself
-
-        return 0
+        return reward_fn(GAME_CONFIGS[game_type], score, game_data or {})
 
     def _update_daily_limits(self, wallet_address: str, game_type: str, earned: float):
-        """Update daily play limits"""
+        """Update daily play limits and return the updated row (None on error)"""
         try:
-            today = date.today()
+            today_iso = date.today().isoformat()
 
-            existing = self.supabase.table('daily_game_limits')\
-                .select('*')\
-                .eq('wallet_address', wallet_address)\
-                .eq('game_type', game_type)\
-                .eq('game_date', today.isoformat())\
-                .execute()
+            result = self.supabase.rpc('bump_daily_limit', {
+                'p_wallet': wallet_address,
+                'p_game': game_type,
+                'p_game_date': today_iso,
+                'p_earned': earned
+            }).execute()
 
-            if existing.data:
-                self.supabase.table('daily_game_limits')\
-                    .update({
-                        'plays_today': existing.data[0]['plays_today'] + 1,
-                        'earned_today': existing.data[0]['earned_today'] + earned
-                    })\
-                    .eq('id', existing.data[0]['id'])\
-                    .execute()
-            else:
-                self.supabase.table('daily_game_limits').insert({
-                    'wallet_address': wallet_address,
-                    'game_date': today.isoformat(),
-                    'game_type': game_type,
-                    'plays_today': 1,
-                    'earned_today': earned
-                }).execute()
+            row = result.data[0] if result.data else None
+            if row:
+                self._record_plays_today(wallet_address, game_type, today_iso, row.get('plays_today'))
+
+            return row
 
         except Exception as e:
             logger.error(f"❌ Error updating daily limits: {e}")
+            return None
+
+    def _bump_user_stats(self, wallet_address: str, game_type: str, score: int,
+                         earned: float = 0, tokens: int = 0):
+        """Insert or increment user_game_stats via the bump_user_stats RPC"""
+        result = self.supabase.rpc('bump_user_stats', {
+            'p_wallet': wallet_address,
+            'p_game': game_type,
+            'p_score': score,
+            'p_earned': earned,
+            'p_tokens': tokens
+        }).execute()
+        self.invalidate_stats(wallet_address)
+
+        return result.data[0] if result.data else None
+
+    def invalidate_stats(self, wallet_address: str):
+        """Drop the cached (or prefetched) get_user_stats result for a wallet"""
+        self._stats_cache.delete(wallet_address)
+        if self._prefetch_futures.pop(wallet_address, None) is not None:
+            self.prefetch_stats['wasted'] += 1
+
+    def _prefetch_fresh(self, entry) -> bool:
+        """True if a prefetch entry is young enough to serve"""
+        return time.monotonic() - entry[1] < self._stats_cache.default_ttl
+
+    def prefetch_for_wallet(self, wallet_address: str, difficulty: str = None):
+        """Warm user stats and quiz questions in the background while the dashboard renders"""
+        pending = self._prefetch_futures.get(wallet_address)
+        if pending is not None and not pending[0].done():
+            return
+
+        # Forget prefetches nobody picked up in time
+        fresh = {w: e for w, e in self._prefetch_futures.items() if self._prefetch_fresh(e)}
+        self.prefetch_stats['wasted'] += len(self._prefetch_futures) - len(fresh)
+        self._prefetch_futures = fresh
+
+        if self._stats_cache.get(wallet_address) is None:
+            future = self._run_in_background(
+                self._single_flight, ('stats', wallet_address), self._fetch_user_stats, wallet_address
+            )
+            self._prefetch_futures[wallet_address] = (future, time.monotonic())
+
+        # Shared across wallets; concurrent misses already wait on the fill lock
+        if _quiz_cache.get(f"quiz:{difficulty}") is None:
+            self._run_in_background(self.get_quiz_questions, difficulty)
 
     def _update_user_stats(self, wallet_address: str, game_type: str, score: int, reward_amount: float) -> dict:
         """Update user game statistics"""
         try:
-            existing = self.supabase.table('user_game_stats')\
-                .select('*')\
-                .eq('wallet_address', wallet_address)\
-                .eq('game_type', game_type)\
-                .execute()
-
-            if existing.data:
-                stats = existing.data[0]
-                self.supabase.table('user_game_stats')\
-                    .update({
-                        'total_plays': stats['total_plays'] + 1,
-                        'total_score': stats['total_score'] + score,
-                        'highest_score': max(stats['highest_score'], score),
-                        'total_earned': stats['total_earned'] + reward_amount,
-                        'last_played': datetime.now().isoformat()
-                    })\
-                    .eq('id', stats['id'])\
-                    .execute()
-            else:
-                self.supabase.table('user_game_stats').insert({
-                    'wallet_address': wallet_address,
-                    'game_type': game_type,
-                    'total_plays': 1,
-                    'total_score': score,
-                    'highest_score': score,
-                    'total_earned': reward_amount,
-                    'virtual_tokens': 0,
-                    'last_played': datetime.now().isoformat()
-                }).execute()
+            return self._bump_user_stats(wallet_address, game_type, score, earned=reward_amount)
 
         except Exception as e:
             logger.error(f"❌ Error updating user stats: {e}")
@@ -553,53 +810,17 @@ class MinigamesManager:
     def _update_user_stats_with_tokens(self, wallet_address: str, game_type: str, score: int, tokens_earned: int) -> dict:
         """Update user game statistics with virtual tokens"""
         try:
-            existing = self.supabase.table('user_game_stats')\
-                .select('*')\
-                .eq('wallet_address', wallet_address)\
-                .eq('game_type', game_type)\
-                .execute()
-
-            if existing.data:
-                stats = existing.data[0]
-                new_token_total = stats.get('virtual_tokens', 0) + tokens_earned
-
-                result = self.supabase.table('user_game_stats')\
-                    .update({
-                        'total_plays': stats['total_plays'] + 1,
-                        'total_score': stats['total_score'] + score,
-                        'highest_score': max(stats['highest_score'], score),
-                        'virtual_tokens': new_token_total,
-                        'last_played': datetime.now().isoformat()
-                    })\
-                    .eq('id', stats['id'])\
-                    .execute()
-
-                logger.info(f"✅ Updated tokens: {stats.get('virtual_tokens', 0)} + {tokens_earned} = {new_token_total}")
-
-                return {
-                    'virtual_tokens': new_token_total,
-                    'tokens_earned': tokens_earned,
-                    'previous_tokens': stats.get('virtual_tokens', 0)
-                }
-            else:
-                result = self.supabase.table('user_game_stats').insert({
-                    'wallet_address': wallet_address,
-                    'game_type': game_type,
-                    'total_plays': 1,
-                    'total_score': score,
-                    'highest_score': score,
-                    'total_earned': 0,
-                    'virtual_tokens': tokens_earned,
-                    'last_played': datetime.now().isoformat()
-                }).execute()
+            stats = self._bump_user_stats(wallet_address, game_type, score, tokens=tokens_earned) or {}
+            new_token_total = stats.get('virtual_tokens', tokens_earned)
+            previous_tokens = new_token_total - tokens_earned
 
-                logger.info(f"✅ Created new stats with {tokens_earned} tokens")
+            logger.info(f"✅ Updated tokens: {previous_tokens} + {tokens_earned} = {new_token_total}")
 
-                return {
-                    'virtual_tokens': tokens_earned,
-                    'tokens_earned': tokens_earned,
-                    'previous_tokens': 0
-                }
+            return {
+                'virtual_tokens': new_token_total,
+                'tokens_earned': tokens_earned,
+                'previous_tokens': previous_tokens
+            }
 
         except Exception as e:
             logger.error(f"❌ Error updating user stats with tokens: {e}")
@@ -610,7 +831,7 @@ class MinigamesManager:
         try:
             # Get user's balance
             balance_result = self.supabase.table('minigame_balances')\
-                .select('*')\
+                .select('available_balance')\
                 .eq('wallet_address', wallet_address)\
                 .execute()
 
@@ -641,38 +862,28 @@ class MinigamesManager:
                 }
 
             # Disburse from GAMES_KEY
-            session_id = f"WITHDRAW-{uuid.uuid4().hex[:8].upper()}"
+            session_id = f"WITHDRAW-{secrets.token_hex(4).upper()}"
             disburse_result = await self.blockchain_service.disburse_from_games_key(
                 wallet_address, available_balance, session_id
             )
 
             # ONLY update balance if blockchain transaction was successful
             if disburse_result['success']:
-                # Update balance - set to 0 and add to total withdrawn
-                total_withdrawn = balance_data.get('total_withdrawn', 0) + available_balance
-
-                self.supabase.table('minigame_balances')\
-                    .update({
-                        'available_balance': 0,
-                        'total_withdrawn': total_withdrawn,
-                        'updated_at': datetime.now().isoformat()
-                    })\
-                    .eq('wallet_address', wallet_address)\
-                    .execute()
-
-                # Clear balance cache to force refresh
-                cache_key = f'minigame_balance_{wallet_address}'
-                if hasattr(self, '_cache') and cache_key in self._cache:
-                    del self._cache[cache_key]
-
-                # Log the withdrawal
-                self.supabase.table('minigame_withdrawals_log').insert({
-                    'wallet_address': wallet_address,
-                    'amount': available_balance,
-                    'tx_hash': disburse_result['tx_hash'],
-                    'session_id': session_id,
-                    'withdrawal_date': date.today().isoformat()
-                }).execute()
+                # Debit the balance and log the withdrawal in one transaction.
+                # The G$ have already been sent, so a failed write must not
+                # fail the response: retry it in the background instead
+                record_args = {
+                    'p_wallet': wallet_address,
+                    'p_amount': available_balance,
+                    'p_tx_hash': disburse_result['tx_hash'],
+                    'p_session_id': session_id,
+                    'p_withdrawal_date': date.today().isoformat()
+                }
+                try:
+                    self._record_withdrawal(record_args)
+                except Exception as record_error:
+                    logger.error(f"❌ Recording withdrawal {disburse_result['tx_hash']} failed, retrying in background: {record_error}")
+                    self._run_in_background(self._record_withdrawal, record_args, retries=3)
 
                 logger.info(f"✅ Balance withdrawn successfully: {available_balance} G$")
 
@@ -709,62 +920,149 @@ class MinigamesManager:
                 'balance_safe': True
             }
 
+    def _record_withdrawal(self, record_args: dict, retries: int = 0):
+        """Call the record_withdrawal RPC (idempotent per tx_hash), retrying with backoff"""
+        for attempt in range(retries + 1):
+            try:
+                self.supabase.rpc('record_withdrawal', record_args).execute()
+                break
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+        # Clear balance cache to force refresh
+        self._invalidate_balance(record_args['p_wallet'])
+
+    def get_cache_metrics(self) -> dict:
+        """Hit/miss counters for the quiz, stats and prefetch layers (for tuning TTLs and sizes)"""
+        quiz = _quiz_cache.get_stats()
+        stats = self._stats_cache.get_stats()
+        return {
+            'quiz_cache': quiz,
+            'stats_cache': stats,
+            'prefetch': dict(self.prefetch_stats),
+            'coalesced_reads': self.coalesced_reads,
+            'db_roundtrips_saved': quiz['hits'] + stats['hits'] + self.prefetch_stats['hits'] + self.coalesced_reads
+        }
+
     def get_user_stats(self, wallet_address: str) -> dict:
         """Get user game statistics"""
+        prefetched = self._prefetch_futures.pop(wallet_address, None)
+        if prefetched is not None and not self._prefetch_fresh(prefetched):
+            self.prefetch_stats['wasted'] += 1
+            prefetched = None
+        if prefetched is not None:
+            try:
+                result = prefetched[0].result(timeout=self.PREFETCH_WAIT)
+                self.prefetch_stats['hits'] += 1
+                return result
+            except Exception as e:
+                self.prefetch_stats['misses'] += 1
+                logger.warning(f"⚠️ Stats prefetch unusable for {wallet_address[:8]}...: {e}")
+
+        cached = self._stats_cache.get(wallet_address)
+        if cached is not None:
+            return cached
+
+        return self._single_flight(('stats', wallet_address), self._fetch_user_stats, wallet_address)
+
+    def _fetch_user_stats(self, wallet_address: str) -> dict:
+        """Query user_game_stats and cache the result"""
         try:
             logger.info(f"🔍 Querying user_game_stats for {wallet_address[:8]}...")
 
             stats = self.supabase.table('user_game_stats')\
-                .select('*')\
+                .select('game_type,virtual_tokens,total_plays')\
                 .eq('wallet_address', wallet_address)\
                 .execute()
 
             stats_data = stats.data or []
             logger.info(f"📊 Found {len(stats_data)} game records for {wallet_address[:8]}...")
 
-            if stats_data:
+            if stats_data and logger.isEnabledFor(logging.DEBUG):
                 for stat in stats_data:
-                    logger.info(f"   Game: {stat.get('game_type')}, Tokens: {stat.get('virtual_tokens', 0)}")
+                    logger.debug("   Game: %s, Tokens: %s", stat.get('game_type'), stat.get('virtual_tokens', 0))
 
-            return {
+            result = {
                 'success': True,
                 'stats': stats_data
             }
+            self._stats_cache.set(wallet_address, result)
+
+            return result
 
         except Exception as e:
-            logger.error(f"❌ Error getting user stats: {e}")
-            import traceback
-            logger.error(f"🔍 Traceback: {traceback.format_exc()}")
+            logger.exception("❌ Error getting user stats: %s", e)
             return {'success': True, 'error': str(e), 'stats': []}
 
-    def get_quiz_questions(self, difficulty: str = None) -> list:
+    async def aget_user_stats(self, wallet_address: str) -> dict:
+        """Async get_user_stats; the blocking query runs in a worker thread"""
+        return await asyncio.to_thread(self.get_user_stats, wallet_address)
+
+    def _load_quiz_pool(self, cache_key: str) -> list:
+        """Fetch a random question pool and cache it"""
+        # Sampled in Postgres (Learn & Earn schema: question_id, question,
+        # answer_a, answer_b, answer_c, answer_d, correct)
+        questions = self.supabase.rpc('get_random_quiz', {'n': QUIZ_POOL_SIZE}).execute()
+        all_questions = questions.data or []
+        _quiz_cache.set(cache_key, all_questions)
+        if all_questions:
+            self._save_quiz_cache_to_disk(cache_key, all_questions)
+        return all_questions
+
+    def _read_quiz_disk_cache(self) -> dict:
+        try:
+            with open(QUIZ_DISK_CACHE_PATH) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _prime_quiz_cache_from_disk(self):
+        """Load still-fresh quiz pools written by a previous process"""
+        now = time.time()
+        for cache_key, entry in self._read_quiz_disk_cache().items():
+            remaining = QUIZ_DISK_CACHE_TTL - (now - entry.get('saved_at', 0))
+            if remaining > 0 and entry.get('rows'):
+                _quiz_cache.set(cache_key, entry['rows'], ttl=min(int(remaining), _quiz_cache.default_ttl))
+                logger.info(f"📦 Primed quiz cache '{cache_key}' from disk ({len(entry['rows'])} questions)")
+
+    def _save_quiz_cache_to_disk(self, cache_key: str, rows: list):
+        """Write a quiz pool through to the disk cache (atomic replace)"""
+        try:
+            entries = self._read_quiz_disk_cache()
+            entries[cache_key] = {'saved_at': time.time(), 'rows': rows}
+            tmp_path = f"{QUIZ_DISK_CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, QUIZ_DISK_CACHE_PATH)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write quiz disk cache: {e}")
+
+    def get_quiz_questions(self, difficulty: str = None) -> list[QuizQ]:
         """Get random quiz questions (using Learn & Earn schema)"""
         try:
-            # Use Learn & Earn schema: question_id, question, answer_a, answer_b, answer_c, answer_d, correct
-            query = self.supabase.table('quiz_questions').select('*')
-
-            questions = query.execute()
-
-            if questions.data:
-                # Randomize and limit to 10
-                random.shuffle(questions.data)
-                quiz_questions = []
-
-                for i, q in enumerate(questions.data[:10]):
-                    quiz_questions.append({
-                        'question_number': i + 1,
-                        'question_id': q.get('question_id'),
-                        'question': q.get('question'),
-                        'options': [
-                            q.get('answer_a'),
-                            q.get('answer_b'),
-                            q.get('answer_c'),
-                            q.get('answer_d')
-                        ],
-                        'correct_answer': ord(q.get('correct', 'A')) - ord('A')  # Convert A,B,C,D to 0,1,2,3
-                    })
-
-                return quiz_questions
+            cache_key = f"quiz:{difficulty}"
+            all_questions = _quiz_cache.get(cache_key)
+
+            if all_questions is None:
+                # One filler per key; concurrent misses wait and reuse its result
+                all_questions = self._single_flight(('quiz', cache_key), self._load_quiz_pool, cache_key)
+
+            if all_questions:
+                # Randomize and limit to QUIZ_SIZE
+                sample = random.sample(all_questions, min(QUIZ_SIZE, len(all_questions)))
+
+                return [
+                    QuizQ(
+                        i + 1,
+                        q['question_id'],
+                        q['question'],
+                        list(_QUIZ_OPTIONS(q)),
+                        _QUIZ_LETTER_TO_IDX.get(q.get('correct'), 0)  # Convert A,B,C,D to 0,1,2,3
+                    )
+                    for i, q in enumerate(sample)
+                ]
 
             return []
 
@@ -772,5 +1070,9 @@ class MinigamesManager:
             logger.error(f"❌ Error getting quiz questions: {e}")
             return []
 
+    async def aget_quiz_questions(self, difficulty: str = None) -> list[QuizQ]:
+        """Async get_quiz_questions; the blocking query runs in a worker thread"""
+        return await asyncio.to_thread(self.get_quiz_questions, difficulty)
+
 # Global instance
 minigames_manager = MinigamesManager()
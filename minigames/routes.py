@@ -3,6 +3,7 @@ import asyncio
 from flask import Blueprint, request, jsonify, render_template, session, redirect
 from .minigames_manager import minigames_manager
 from maintenance_service import maintenance_service
+from supabase_client import is_admin
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +24,9 @@ def minigames_home():
         maintenance_message = maintenance_status.get('message', 'Minigames are temporarily under maintenance. Please check back later.')
         return render_template('minigames.html', wallet=wallet, maintenance_mode=True, maintenance_message=maintenance_message)
 
+    # Start the stats/quiz queries now so they overlap with page rendering
+    minigames_manager.prefetch_for_wallet(wallet)
+
     return render_template('minigames.html', wallet=wallet, maintenance_mode=False)
 
 @minigames_bp.route('/api/check-limit/<game_type>')
@@ -207,6 +211,18 @@ def get_user_stats():
             'error': str(e)
         }), 500
 
+@minigames_bp.route('/api/cache-metrics')
+def get_cache_metrics():
+    """Cache/prefetch counters for tuning (admin only)"""
+    wallet = session.get('wallet')
+    if not wallet or not session.get('verified'):
+        return jsonify({'success': False, 'error': 'Authentication required'}), 401
+
+    if not is_admin(wallet):
+        return jsonify({'success': False, 'error': 'Admin access required'}), 403
+
+    return jsonify({'success': True, 'metrics': minigames_manager.get_cache_metrics()})
+
 @minigames_bp.route('/api/quiz-questions')
 def get_quiz_questions():
     """Get quiz questions"""
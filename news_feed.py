@@ -7,7 +7,7 @@ from flask import request, jsonify, session, redirect, render_template
 from markupsafe import Markup
 
 # Import real Supabase client
-from supabase_client import get_supabase_client, supabase_enabled, safe_supabase_operation, supabase_logger
+from supabase_client import get_supabase_client, supabase_enabled, safe_supabase_operation, supabase_logger, EMPTY_RESULT
 from analytics_service import analytics
 
 
@@ -326,7 +326,7 @@ class NewsFeedService:
             # Don't include 'id' - let the database auto-generate it
             result = safe_supabase_operation(
                 lambda: self.client.table("news_articles").insert(article_data).execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
+                fallback_result=EMPTY_RESULT,
                 operation_name="insert news article"
             )
 
@@ -340,6 +340,21 @@ class NewsFeedService:
             logger.error(f"❌ Error adding news article: {e}")
             return {"success": False, "error": str(e)}
 
+    def set_article_image(self, article_id, image_url: str) -> bool:
+        """Attach an uploaded image to an existing article"""
+        if not self.enabled or not self.client:
+            return False
+
+        result = safe_supabase_operation(
+            lambda: self.client.table("news_articles")
+                .update({"image_url": image_url})
+                .eq("id", article_id)
+                .execute(),
+            fallback_result=EMPTY_RESULT,
+            operation_name="set news article image"
+        )
+        return bool(result.data)
+
     def get_news_stats(self) -> Dict:
         """Get news feed statistics"""
         if not self.enabled or not self.client:
@@ -357,7 +372,7 @@ class NewsFeedService:
                     .select("id")
                     .eq("published", True)
                     .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
+                fallback_result=EMPTY_RESULT,
                 operation_name="get total articles count"
             )
 
@@ -368,7 +383,7 @@ class NewsFeedService:
                     .eq("published", True)
                     .eq("featured", True)
                     .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
+                fallback_result=EMPTY_RESULT,
                 operation_name="get featured articles count"
             )
 
@@ -380,7 +395,7 @@ class NewsFeedService:
                     .eq("published", True)
                     .gte("created_at", recent_cutoff)
                     .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
+                fallback_result=EMPTY_RESULT,
                 operation_name="get recent articles count"
             )
 
@@ -1,10 +1,31 @@
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, session, redirect, Response, g
 from blockchain import has_recent_ubi_claim, GOODDOLLAR_CONTRACTS
 from analytics_service import analytics
-from supabase_client import get_supabase_client, safe_supabase_operation, supabase_logger, log_admin_action
+from supabase_client import get_supabase_client, safe_supabase_operation, supabase_logger, log_admin_action, is_admin, set_admin_status, EMPTY_RESULT
+from cache_utils import api_cache, blockchain_cache, cache_ubi_claim_key
+from twitter_task.twitter_task import twitter_task_service
+from telegram_task.telegram_task import telegram_task_service
+from facebook_task.facebook_task import facebook_task_service
+from community_stories.community_stories_service import community_stories_service
+from learn_and_earn.learn_and_earn import quiz_manager
+from maintenance_service import maintenance_service
+from news_feed import news_feed_service
+from object_storage_client import download_screenshot, upload_to_imgbb
+from reward_config_service import reward_config_service
+from bs4 import BeautifulSoup
+from postgrest.exceptions import APIError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
 import json
 import logging
 import os
+import requests
+import time
 
 # Logger for this module
 logger = logging.getLogger(__name__)
@@ -12,8 +33,111 @@ logger = logging.getLogger(__name__)
 # Create Blueprint FIRST - BEFORE any route decorators
 routes = Blueprint("routes", __name__)
 
+# Worker pool for running independent blocking service calls side by side
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="routes-io")
+
+# Referral payouts are sent from one hot wallet; a single worker keeps them in
+# order so concurrent sign-ups don't race each other for the same nonce
+_REFERRAL_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="referral-rewards")
+
+# News images are pushed to ImgBB after the article is saved so publishing
+# doesn't hold a request worker for the whole upload
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="imgbb-upload")
+
+def run_async(coro):
+    """Run a service coroutine to completion from a sync request handler"""
+    return asyncio.run(coro)
+
+@functools.lru_cache(maxsize=1)
+def _recent_window(minute_bucket):
+    """ISO timestamp 24 hours before the given minute, stable within that minute"""
+    return (datetime.utcfromtimestamp(minute_bucket * 60) - timedelta(hours=24)).isoformat()
+
+@functools.lru_cache(maxsize=1)
+def _today_iso(day_bucket):
+    """UTC date string (YYYY-MM-DD) for the given day"""
+    return datetime.utcfromtimestamp(day_bucket * 86400).strftime('%Y-%m-%d')
+
+def _short(wallet):
+    """Truncated wallet for public display names (0x1234...abcd)"""
+    return f"{wallet[:6]}...{wallet[-4:]}"
+
+def _postgrest_quote(value):
+    """Quote a value for use inside a PostgREST or=(...) filter"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def paginate_newest_first(query, limit, operation_name, tiebreak):
+    """Page a query by (created_at, tiebreak), newest first
+
+    With ?cursor=<created_at>|<tiebreak> of the last row seen this is keyset
+    pagination (an index seek, however deep the page); the unique tiebreak
+    column keeps rows sharing a created_at from being skipped between pages.
+    ?offset= is still accepted for older clients. Returns (rows, next_cursor).
+    """
+    cursor = request.args.get('cursor')
+    if cursor:
+        created_at, _, last_key = cursor.partition('|')
+        if last_key:
+            created_at, last_key = _postgrest_quote(created_at), _postgrest_quote(last_key)
+            query = query.or_(
+                f"created_at.lt.{created_at},"
+                f"and(created_at.eq.{created_at},{tiebreak}.lt.{last_key})"
+            )
+        else:
+            # Cursor from before the tiebreak was added
+            query = query.lt('created_at', created_at)
+        query = query.limit(limit)
+    else:
+        offset = int(request.args.get('offset', 0))
+        query = query.range(offset, offset + limit - 1)
+
+    result = safe_supabase_operation(
+        lambda: query.order('created_at', desc=True).order(tiebreak, desc=True).execute(),
+        fallback_result=EMPTY_RESULT,
+        operation_name=operation_name
+    )
+    rows = result.data or []
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = f"{rows[-1].get('created_at')}|{rows[-1].get(tiebreak)}"
+    return rows, next_cursor
+
+def cacheable_json(payload, max_age=60):
+    """jsonify a public payload with a content-hash ETag, answering If-None-Match with 304"""
+    response = jsonify(payload)
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    response.headers['Cache-Control'] = f'public, max-age={max_age}, stale-while-revalidate=300'
+    return response.make_conditional(request)
+
+UBI_CHECK_TTL = 600
+
+def check_ubi_claim(wallet):
+    """has_recent_ubi_claim with passing results cached for 10 minutes
+
+    The claim window is 24 hours, so a short cache keeps page loads and polling
+    endpoints off the chain; failures are never cached and drop any cached pass.
+    A pass is also stamped into the session (ubi_verified_until) so the signed-in
+    user's own requests skip even the cache lookup until it runs out.
+    """
+    if session.get('wallet') == wallet and session.get('ubi_verified_until', 0) > time.time():
+        return {"status": "success"}
+
+    ubi_cache_key = cache_ubi_claim_key(wallet)
+    ubi_check = blockchain_cache.get(ubi_cache_key)
+    if ubi_check is None:
+        ubi_check = has_recent_ubi_claim(wallet)
+        if ubi_check["status"] == "success":
+            blockchain_cache.set(ubi_cache_key, ubi_check, ttl=UBI_CHECK_TTL)
+    if ubi_check["status"] != "success":
+        blockchain_cache.delete(ubi_cache_key)
+        session.pop('ubi_verified_until', None)
+    elif session.get('wallet') == wallet:
+        session['ubi_verified_until'] = time.time() + UBI_CHECK_TTL
+    return ubi_check
+
 def auth_required(f):
     """Decorator for endpoints requiring authentication with auto-logout on expiry"""
+    @functools.wraps(f)
     def wrapper(*args, **kwargs):
         wallet = session.get("wallet")
         verified = session.get("verified")
@@ -22,8 +146,7 @@ def auth_required(f):
             return jsonify({"success": False, "error": "Authentication required"}), 401
 
         # Check if UBI claim is still valid (recent within 24 hours)
-        from blockchain import has_recent_ubi_claim
-        ubi_check = has_recent_ubi_claim(wallet)
+        ubi_check = check_ubi_claim(wallet)
 
         if ubi_check["status"] != "success":
             # UBI claim expired - auto logout
@@ -36,23 +159,45 @@ def auth_required(f):
                 "redirect": "/"
             }), 401
 
+        # Handlers read the verified wallet from g instead of the session
+        g.wallet = wallet
+        return f(*args, **kwargs)
+    return wrapper
+
+def verified_page(f):
+    """Decorator for pages requiring a verified session; redirects guests to the homepage"""
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        wallet = session.get('wallet') or session.get('wallet_address')
+        verified = session.get('verified') or session.get('ubi_verified')
+
+        if not wallet or not verified:
+            return redirect("/")
+
+        g.wallet = wallet
         return f(*args, **kwargs)
-    wrapper.__name__ = f.__name__
     return wrapper
 
 def admin_required(f):
     """Decorator for endpoints requiring admin authentication"""
+    @functools.wraps(f)
     def wrapper(*args, **kwargs):
         wallet = session.get("wallet")
         if not session.get("verified") or not wallet:
             return jsonify({"success": False, "error": "Authentication required"}), 401
 
-        from supabase_client import is_admin
-        if not is_admin(wallet):
-            return jsonify({"success": False, "error": "Admin access required"}), 403
-
+        # A confirmed admin is remembered in the session for 10 minutes so
+        # admin API calls don't each re-check the database
+        admin_confirmed = session.get("is_admin") and time.time() - session.get("is_admin_checked_at", 0) < 600
+        if not admin_confirmed:
+            if not is_admin(wallet):
+                session.pop("is_admin", None)
+                return jsonify({"success": False, "error": "Admin access required"}), 403
+            session["is_admin"] = True
+            session["is_admin_checked_at"] = time.time()
+
+        g.wallet = wallet
         return f(*args, **kwargs)
-    wrapper.__name__ = f.__name__
     return wrapper
 
 @routes.route('/api/daily-task/claim', methods=['POST'])
@@ -60,7 +205,7 @@ def admin_required(f):
 def claim_daily_task():
     """Claim unified daily task (Twitter or Telegram)"""
     try:
-        wallet = session.get('wallet')
+        wallet = g.wallet
         data = request.get_json()
 
         platform = data.get('platform')  # 'twitter' or 'telegram' or 'facebook'
@@ -80,36 +225,25 @@ def claim_daily_task():
 
         # Import appropriate service
         if platform == 'twitter':
-            from twitter_task.twitter_task import twitter_task_service
             service = twitter_task_service
         elif platform == 'telegram':
-            from telegram_task.telegram_task import telegram_task_service
             service = telegram_task_service
         else:  # facebook
-            from facebook_task.facebook_task import facebook_task_service
             service = facebook_task_service
 
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        result = run_async(service.claim_task_reward(wallet, post_url))
 
-        try:
-            result = loop.run_until_complete(
-                service.claim_task_reward(wallet, post_url)
-            )
-
-            if result.get('success'):
-                return jsonify(result), 200
-            else:
-                return jsonify(result), 400
-
-        finally:
-            loop.close()
+        if result.get('success'):
+            # New submission: drop the cached public recent-tasks feed and
+            # this wallet's cached claim status
+            api_cache.delete("recent_daily_tasks")
+            api_cache.delete(f"daily_status:{wallet}")
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 400
 
     except Exception as e:
-        logger.error(f"❌ Daily task claim error: {e}")
-        import traceback
-        logger.error(f"🔍 Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Daily task claim error: {e}")
         return jsonify({'success': False, 'error': 'Failed to claim reward'}), 500
 
 @routes.route('/api/daily-task/status', methods=['GET'])
@@ -117,136 +251,138 @@ def claim_daily_task():
 def get_daily_task_status():
     """Get unified daily task status (checks both Twitter and Telegram)"""
     try:
-        wallet = session.get('wallet')
-
-        # Import both services
-        from twitter_task.twitter_task import twitter_task_service
-        from telegram_task.telegram_task import telegram_task_service
-        from datetime import datetime, timezone
-
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        try:
-            # Check all three tasks
-            twitter_status = loop.run_until_complete(twitter_task_service.check_eligibility(wallet))
-            telegram_status = loop.run_until_complete(telegram_task_service.check_eligibility(wallet))
-
-            from facebook_task.facebook_task import facebook_task_service
-            facebook_status = loop.run_until_complete(facebook_task_service.check_eligibility(wallet))
+        wallet = g.wallet
+
+        # The frontend countdown polls this endpoint; serve repeat polls from
+        # a short per-wallet cache (at most 30 seconds, 5 while claimable)
+        status_cache_key = f"daily_status:{wallet}"
+        cached_status = api_cache.get(status_cache_key)
+        if cached_status is not None:
+            if cached_status['next_claim_time']:
+                # Keep the countdown exact rather than frozen at cache time
+                next_claim_dt = datetime.fromisoformat(cached_status['next_claim_time'].replace('Z', '+00:00'))
+                remaining = max(0, int((next_claim_dt - datetime.now(timezone.utc)).total_seconds()))
+                cached_status = {**cached_status, 'time_remaining_seconds': remaining}
+            return jsonify(cached_status), 200
+
+        # The three eligibility checks are independent blocking lookups:
+        # run them side by side instead of one after another
+        futures = [
+            _IO_POOL.submit(run_async, service.check_eligibility(wallet))
+            for service in (twitter_task_service, telegram_task_service, facebook_task_service)
+        ]
+        twitter_status, telegram_status, facebook_status = (f.result(timeout=30) for f in futures)
+
+        # CRITICAL FIX: Check ALL platforms for pending AND check database for actual pending submissions
+        # This ensures real-time accuracy even with caching issues
+
+        # First, check direct database for ANY pending submissions
+        supabase = get_supabase_client()
+        actual_pending = False
+        actual_pending_platform = None
 
-            # CRITICAL FIX: Check ALL platforms for pending AND check database for actual pending submissions
-            # This ensures real-time accuracy even with caching issues
+        if supabase:
+            # Check Twitter pending
+            twitter_pending_check = safe_supabase_operation(
+                lambda: supabase.table('twitter_task_log')\
+                    .select('id')\
+                    .eq('wallet_address', wallet)\
+                    .eq('status', 'pending')\
+                    .limit(1)\
+                    .execute(),
+                fallback_result=EMPTY_RESULT,
+                operation_name="check twitter pending"
+            )
 
-            # First, check direct database for ANY pending submissions
-            supabase = get_supabase_client()
-            actual_pending = False
-            actual_pending_platform = None
+            if twitter_pending_check.data and len(twitter_pending_check.data) > 0:
+                actual_pending = True
+                actual_pending_platform = 'Twitter'
 
-            if supabase:
-                # Check Twitter pending
-                twitter_pending_check = safe_supabase_operation(
-                    lambda: supabase.table('twitter_task_log')\
+            # Check Telegram pending only if Twitter not pending
+            if not actual_pending:
+                telegram_pending_check = safe_supabase_operation(
+                    lambda: supabase.table('telegram_task_log')\
                         .select('id')\
                         .eq('wallet_address', wallet)\
                         .eq('status', 'pending')\
                         .limit(1)\
                         .execute(),
-                    fallback_result=type('obj', (object,), {'data': []})(),
-                    operation_name="check twitter pending"
+                    fallback_result=EMPTY_RESULT,
+                    operation_name="check telegram pending"
                 )
 
-                if twitter_pending_check.data and len(twitter_pending_check.data) > 0:
+                if telegram_pending_check.data and len(telegram_pending_check.data) > 0:
                     actual_pending = True
-                    actual_pending_platform = 'Twitter'
-
-                # Check Telegram pending only if Twitter not pending
-                if not actual_pending:
-                    telegram_pending_check = safe_supabase_operation(
-                        lambda: supabase.table('telegram_task_log')\
-                            .select('id')\
-                            .eq('wallet_address', wallet)\
-                            .eq('status', 'pending')\
-                            .limit(1)\
-                            .execute(),
-                        fallback_result=type('obj', (object,), {'data': []})(),
-                        operation_name="check telegram pending"
-                    )
+                    actual_pending_platform = 'Telegram'
 
-                    if telegram_pending_check.data and len(telegram_pending_check.data) > 0:
-                        actual_pending = True
-                        actual_pending_platform = 'Telegram'
-
-                # Check Facebook pending only if Twitter and Telegram not pending
-                if not actual_pending:
-                    facebook_pending_check = safe_supabase_operation(
-                        lambda: supabase.table('facebook_task_log')\
-                            .select('id')\
-                            .eq('wallet_address', wallet)\
-                            .eq('status', 'pending')\
-                            .limit(1)\
-                            .execute(),
-                        fallback_result=type('obj', (object,), {'data': []})(),
-                        operation_name="check facebook pending"
-                    )
+            # Check Facebook pending only if Twitter and Telegram not pending
+            if not actual_pending:
+                facebook_pending_check = safe_supabase_operation(
+                    lambda: supabase.table('facebook_task_log')\
+                        .select('id')\
+                        .eq('wallet_address', wallet)\
+                        .eq('status', 'pending')\
+                        .limit(1)\
+                        .execute(),
+                    fallback_result=EMPTY_RESULT,
+                    operation_name="check facebook pending"
+                )
 
-                    if facebook_pending_check.data and len(facebook_pending_check.data) > 0:
-                        actual_pending = True
-                        actual_pending_platform = 'Facebook'
+                if facebook_pending_check.data and len(facebook_pending_check.data) > 0:
+                    actual_pending = True
+                    actual_pending_platform = 'Facebook'
 
 
-            # Determine pending platform based on actual database check
-            if actual_pending:
-                pending_platform = actual_pending_platform
-            else:
-                pending_platform = None
+        # Determine pending platform based on actual database check
+        if actual_pending:
+            pending_platform = actual_pending_platform
+        else:
+            pending_platform = None
 
-            # Determine next claim time based on eligible platform cooldowns
-            next_claim_time = None
-            if actual_pending:
-                # If there's a pending submission, next_claim_time is not relevant for claiming
-                pass
-            else:
-                # Check for cooldown (completed claims) - if ANY platform has cooldown, ALL are blocked
-                if not twitter_status.get('can_claim') or not telegram_status.get('can_claim') or not facebook_status.get('can_claim'):
-                    # If any platform has cooldown active (from completed claims), all are blocked
-                    twitter_next = twitter_status.get('next_claim_time')
-                    facebook_next = facebook_status.get('next_claim_time')
-                    telegram_next = telegram_status.get('next_claim_time')
-
-                    # Find the earliest next claim time among all platforms
-                    possible_next_claims = [t for t in [twitter_next, telegram_next, facebook_next] if t]
-                    if possible_next_claims:
-                        next_claim_time = min(possible_next_claims)
-
-            # Calculate time remaining if next_claim_time exists
-            time_remaining_seconds = 0
-            if next_claim_time:
-                next_claim_dt = datetime.fromisoformat(next_claim_time.replace('Z', '+00:00'))
-                now = datetime.now(timezone.utc)
-                time_remaining_seconds = max(0, int((next_claim_dt - now).total_seconds()))
-
-            # User can claim if ALL platforms are available (shared cooldown) and no pending submissions
-            can_claim = twitter_status.get('can_claim', False) and \
-                        telegram_status.get('can_claim', False) and \
-                        facebook_status.get('can_claim', False) and \
-                        not actual_pending
+        # Determine next claim time based on eligible platform cooldowns
+        next_claim_time = None
+        if actual_pending:
+            # If there's a pending submission, next_claim_time is not relevant for claiming
+            pass
+        else:
+            # Check for cooldown (completed claims) - if ANY platform has cooldown, ALL are blocked
+            if not twitter_status.get('can_claim') or not telegram_status.get('can_claim') or not facebook_status.get('can_claim'):
+                # If any platform has cooldown active (from completed claims), all are blocked
+                twitter_next = twitter_status.get('next_claim_time')
+                facebook_next = facebook_status.get('next_claim_time')
+                telegram_next = telegram_status.get('next_claim_time')
+
+                # Find the earliest next claim time among all platforms
+                possible_next_claims = [t for t in [twitter_next, telegram_next, facebook_next] if t]
+                if possible_next_claims:
+                    next_claim_time = min(possible_next_claims)
+
+        # Calculate time remaining if next_claim_time exists
+        time_remaining_seconds = 0
+        if next_claim_time:
+            next_claim_dt = datetime.fromisoformat(next_claim_time.replace('Z', '+00:00'))
+            now = datetime.now(timezone.utc)
+            time_remaining_seconds = max(0, int((next_claim_dt - now).total_seconds()))
+
+        # User can claim if ALL platforms are available (shared cooldown) and no pending submissions
+        can_claim = twitter_status.get('can_claim', False) and \
+                    telegram_status.get('can_claim', False) and \
+                    facebook_status.get('can_claim', False) and \
+                    not actual_pending
+
+        status = {
+            'can_claim': can_claim,
+            'has_pending_submission': actual_pending,
+            'pending_platform': pending_platform,
+            'next_claim_time': next_claim_time,
+            'time_remaining_seconds': time_remaining_seconds
+        }
+        api_cache.set(status_cache_key, status, ttl=min(max(time_remaining_seconds, 5), 30))
 
-            return jsonify({
-                'can_claim': can_claim,
-                'has_pending_submission': actual_pending,
-                'pending_platform': pending_platform,
-                'next_claim_time': next_claim_time,
-                'time_remaining_seconds': time_remaining_seconds
-            }), 200
-        finally:
-            loop.close()
+        return jsonify(status), 200
 
     except Exception as e:
-        logger.error(f"❌ Daily task status error: {e}")
-        import traceback
-        logger.error(f"🔍 Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Daily task status error: {e}")
         return jsonify({'error': 'Failed to get task status'}), 500
 
 
@@ -255,53 +391,37 @@ def get_daily_task_status():
 def get_daily_task_history():
     """Get combined Twitter and Telegram task history"""
     try:
-        wallet = session.get('wallet')
+        wallet = g.wallet
         limit = int(request.args.get('limit', 50))
 
-        from twitter_task.twitter_task import twitter_task_service
-        from telegram_task.telegram_task import telegram_task_service
-        from facebook_task.facebook_task import facebook_task_service
-
-        # Get all histories
-        twitter_history = twitter_task_service.get_transaction_history(wallet, limit)
-        telegram_history = telegram_task_service.get_transaction_history(wallet, limit)
-        facebook_history = facebook_task_service.get_transaction_history(wallet, limit)
 
-        # Combine transactions
-        all_transactions = []
-
-        if twitter_history.get('success') and twitter_history.get('transactions'):
-            for tx in twitter_history['transactions']:
-                tx['platform'] = 'twitter'
-                # Ensure rejection_reason is included
-                if 'rejection_reason' not in tx:
-                    tx['rejection_reason'] = None
-                all_transactions.append(tx)
+        # Get all histories (independent queries, fetched concurrently)
+        futures = [
+            _IO_POOL.submit(service.get_transaction_history, wallet, limit)
+            for service in (twitter_task_service, telegram_task_service, facebook_task_service)
+        ]
+        twitter_history, telegram_history, facebook_history = (f.result(timeout=30) for f in futures)
 
-        if telegram_history.get('success') and telegram_history.get('transactions'):
-            for tx in telegram_history['transactions']:
-                tx['platform'] = 'telegram'
-                # Ensure rejection_reason is included
-                if 'rejection_reason' not in tx:
-                    tx['rejection_reason'] = None
-                all_transactions.append(tx)
-
-        if facebook_history.get('success') and facebook_history.get('transactions'):
-            for tx in facebook_history['transactions']:
-                tx['platform'] = 'facebook'
+        # Tag each platform's transactions (each list is already newest first)
+        platform_histories = []
+        for platform, history in (('twitter', twitter_history), ('telegram', telegram_history), ('facebook', facebook_history)):
+            transactions = history.get('transactions') if history.get('success') else None
+            if not transactions:
+                continue
+            for tx in transactions:
+                tx['platform'] = platform
                 # Ensure rejection_reason is included
-                if 'rejection_reason' not in tx:
-                    tx['rejection_reason'] = None
-                all_transactions.append(tx)
-
-        # Sort by date (newest first)
-        all_transactions.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+                tx.setdefault('rejection_reason', None)
+            platform_histories.append(transactions)
 
-        # Limit results
-        all_transactions = all_transactions[:limit]
-
-        # Calculate totals
-        total_earned = sum(float(tx.get('reward_amount', 0)) for tx in all_transactions)
+        # Merge the sorted lists (newest first), keeping only the first `limit`
+        # and totalling rewards in the same pass
+        merged = heapq.merge(*platform_histories, key=lambda x: x.get('created_at') or '', reverse=True)
+        all_transactions = []
+        total_earned = 0.0
+        for tx in itertools.islice(merged, limit):
+            all_transactions.append(tx)
+            total_earned += float(tx.get('reward_amount', 0) or 0)
 
         return jsonify({
             'success': True,
@@ -311,9 +431,7 @@ def get_daily_task_history():
         })
 
     except Exception as e:
-        logger.error(f"❌ Daily task history error: {e}")
-        import traceback
-        logger.error(f"🔍 Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Daily task history error: {e}")
         return jsonify({
             'success': False,
             'error': 'Failed to get history',
@@ -327,10 +445,6 @@ def get_daily_task_history():
 def get_recent_daily_tasks():
     """Get recent daily task submissions from last 24 hours"""
     try:
-        from datetime import datetime, timedelta
-        from supabase_client import get_supabase_client
-        from flask import Response
-        from cache_utils import api_cache, cached
 
         # Check cache first (2 minute TTL)
         cache_key = "recent_daily_tasks"
@@ -348,104 +462,35 @@ def get_recent_daily_tasks():
             return response, 200
 
         # Calculate 24 hours ago
-        twenty_four_hours_ago = (datetime.utcnow() - timedelta(hours=24)).isoformat()
-
-        # Get Twitter task submissions from last 24 hours
-        twitter_submissions = safe_supabase_operation(
-            lambda: supabase.table('twitter_task_log')\
-                .select('wallet_address, reward_amount, created_at, twitter_url')\
-                .gte('created_at', twenty_four_hours_ago)\
-                .order('created_at', desc=True)\
-                .limit(50)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get recent twitter tasks"
-        )
-
-        # Get Telegram task submissions from last 24 hours
-        telegram_submissions = safe_supabase_operation(
-            lambda: supabase.table('telegram_task_log')\
-                .select('wallet_address, reward_amount, created_at, telegram_url')\
-                .gte('created_at', twenty_four_hours_ago)\
-                .order('created_at', desc=True)\
-                .limit(50)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get recent telegram tasks"
-        )
+        twenty_four_hours_ago = _recent_window(int(time.time()) // 60)
 
-        # Get Facebook task submissions from last 24 hours
-        facebook_submissions = safe_supabase_operation(
-            lambda: supabase.table('facebook_task_log')\
-                .select('wallet_address, reward_amount, created_at, facebook_url')\
+        # All three platforms come from one view, already merged, ordered and limited
+        recent_submissions = safe_supabase_operation(
+            lambda: supabase.table('v_recent_task_submissions')\
+                .select('*')\
                 .gte('created_at', twenty_four_hours_ago)\
                 .order('created_at', desc=True)\
-                .limit(50)\
+                .limit(20)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get recent facebook tasks"
+            fallback_result=EMPTY_RESULT,
+            operation_name="get recent task submissions"
         )
 
-        # Combine and format submissions WITH MESSAGES/LINKS
         all_submissions = []
-
-        # Add Twitter submissions WITH LINKS - USE CACHED USERNAMES
-        if twitter_submissions and twitter_submissions.data:
-            for sub in twitter_submissions.data:
-                wallet = sub.get('wallet_address', '')
-
-                all_submissions.append({
-                    'wallet_address': wallet,
-                    'display_name': f"{wallet[:6]}...{wallet[-4:]}",
-                    'reward_amount': float(sub.get('reward_amount', 0)),
-                    'created_at': sub.get('created_at'),
-                    'platform': 'Twitter',
-                    'submission_url': sub.get('twitter_url', ''),
-                    'submission_type': 'twitter_post',
-                    'status': sub.get('status', 'completed'),
-                    'rejection_reason': sub.get('rejection_reason')
-                })
-
-        # Add Telegram submissions WITH LINKS
-        if telegram_submissions and telegram_submissions.data:
-            for sub in telegram_submissions.data:
-                wallet = sub.get('wallet_address', '')
-
-                all_submissions.append({
-                    'wallet_address': wallet,
-                    'display_name': f"{wallet[:6]}...{wallet[-4:]}",
-                    'reward_amount': float(sub.get('reward_amount', 0)),
-                    'created_at': sub.get('created_at'),
-                    'platform': 'Telegram',
-                    'submission_url': sub.get('telegram_url', ''),
-                    'submission_type': 'telegram_post',
-                    'status': sub.get('status', 'completed'),
-                    'rejection_reason': sub.get('rejection_reason')
-                })
-
-        # Add Facebook submissions WITH LINKS
-        if facebook_submissions and facebook_submissions.data:
-            for sub in facebook_submissions.data:
-                wallet = sub.get('wallet_address', '')
-
-                all_submissions.append({
-                    'wallet_address': wallet,
-                    'display_name': f"{wallet[:6]}...{wallet[-4:]}",
-                    'reward_amount': float(sub.get('reward_amount', 0)),
-                    'created_at': sub.get('created_at'),
-                    'platform': 'Facebook',
-                    'submission_url': sub.get('facebook_url', ''),
-                    'submission_type': 'facebook_post',
-                    'status': sub.get('status', 'completed'),
-                    'rejection_reason': sub.get('rejection_reason')
-                })
-
-
-        # Sort by created_at (newest first)
-        all_submissions.sort(key=lambda x: x['created_at'], reverse=True)
-
-        # Limit to 20 most recent
-        all_submissions = all_submissions[:20]
+        for sub in recent_submissions.data or []:
+            wallet = sub.get('wallet_address', '')
+
+            all_submissions.append({
+                'wallet_address': wallet,
+                'display_name': _short(wallet),
+                'reward_amount': float(sub.get('reward_amount', 0)),
+                'created_at': sub.get('created_at'),
+                'platform': sub.get('platform'),
+                'submission_url': sub.get('submission_url', ''),
+                'submission_type': sub.get('submission_type'),
+                'status': 'completed',
+                'rejection_reason': None
+            })
 
         logger.info(f"✅ Returning {len(all_submissions)} recent daily task submissions")
 
@@ -464,9 +509,7 @@ def get_recent_daily_tasks():
         return response, 200
 
     except Exception as e:
-        logger.error(f"❌ Error getting recent daily tasks: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Error getting recent daily tasks: {e}")
         error_response = jsonify({"success": False, "submissions": [], "error": str(e)})
         error_response.headers['Content-Type'] = 'application/json'
         return error_response, 500
@@ -475,23 +518,27 @@ def get_recent_daily_tasks():
 def get_learn_earn_participants():
     """Get Learn & Earn participants for a specific date or date range"""
     try:
-        from datetime import datetime
-        from supabase_client import get_supabase_client
+
+        # Get date parameter (format: YYYY-MM-DD)
+        target_date = request.args.get('date')
+
+        # Check cache first (45 second TTL)
+        cache_key = f"learn_earn_participants:{target_date or 'today'}"
+        cached_result = api_cache.get(cache_key)
+        if cached_result:
+            return jsonify(cached_result)
 
         supabase = get_supabase_client()
         if not supabase:
             return jsonify({"success": False, "participants": []})
 
-        # Get date parameter (format: YYYY-MM-DD)
-        target_date = request.args.get('date')
-
         if target_date:
             # Query for specific date with proper UTC timezone format
             start_datetime = f"{target_date}T00:00:00Z"
             end_datetime = f"{target_date}T23:59:59Z"
         else:
             # Default to today with proper UTC timezone format
-            today = datetime.utcnow().strftime('%Y-%m-%d')
+            today = _today_iso(int(time.time()) // 86400)
             start_datetime = f"{today}T00:00:00Z"
             end_datetime = f"{today}T23:59:59Z"
 
@@ -507,7 +554,7 @@ def get_learn_earn_participants():
                 .eq('status', True)\
                 .order('timestamp', desc=False)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get learn earn participants"
         )
 
@@ -524,7 +571,7 @@ def get_learn_earn_participants():
 
                 formatted_participants.append({
                     'wallet_address': wallet,
-                    'display_name': f"{wallet[:6]}...{wallet[-4:]}",
+                    'display_name': _short(wallet),
                     'amount_g$': amount,
                     'amount_formatted': f"{amount:,.1f} G$",
                     'timestamp': p.get('timestamp'),
@@ -534,19 +581,21 @@ def get_learn_earn_participants():
         else:
             logger.info(f"ℹ️ No Learn & Earn participants found for {target_date or 'today'}")
 
-        return jsonify({
+        result = {
             "success": True,
             "participants": formatted_participants,
             "total_count": len(formatted_participants),
             "total_g_disbursed": total_g_disbursed,
             "total_g_disbursed_formatted": f"{total_g_disbursed:,.2f} G$",
-            "date": target_date if target_date else datetime.utcnow().strftime('%Y-%m-%d')
-        })
+            "date": target_date if target_date else _today_iso(int(time.time()) // 86400)
+        }
+
+        api_cache.set(cache_key, result, ttl=45)
+
+        return jsonify(result)
 
     except Exception as e:
-        logger.error(f"❌ Error getting Learn & Earn participants: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Error getting Learn & Earn participants: {e}")
         return jsonify({
             "success": False,
             "participants": [],
@@ -559,9 +608,17 @@ def get_learn_earn_participants():
 def serve_screenshot(filename):
     """Serve screenshot from Object Storage"""
     try:
-        from object_storage_client import download_screenshot
-        from flask import send_file
-        import io
+
+        # Stored filenames embed the submission id and are never overwritten,
+        # so the ETag can be derived from the name alone and a revalidating
+        # browser is answered without touching Object Storage
+        etag = hashlib.blake2b(filename.encode(), digest_size=16).hexdigest()
+        cache_headers = {
+            'ETag': f'"{etag}"',
+            'Cache-Control': 'public, max-age=31536000, immutable'
+        }
+        if etag in request.if_none_match:
+            return Response(status=304, headers=cache_headers)
 
         # Download from Object Storage
         file_data = download_screenshot(filename)
@@ -569,12 +626,8 @@ def serve_screenshot(filename):
         if not file_data:
             return jsonify({"success": False, "error": "Screenshot not found"}), 404
 
-        # Return as image
-        return send_file(
-            io.BytesIO(file_data),
-            mimetype='image/png',
-            as_attachment=False
-        )
+        # Return the bytes directly as the image body
+        return Response(file_data, mimetype='image/png', headers=cache_headers)
 
     except Exception as e:
         logger.error(f"❌ Error serving screenshot: {e}")
@@ -584,34 +637,31 @@ def serve_screenshot(filename):
 def get_community_screenshots():
     """Get community screenshots for homepage"""
     try:
-        from community_stories.community_stories_service import community_stories_service
-        from supabase_client import get_supabase_client
-        from cache_utils import api_cache
+
+        limit = int(request.args.get('limit', 12))
 
         # Check cache first (2 minute TTL)
-        cache_key = "community_screenshots"
+        cache_key = f"community_screenshots:{limit}"
         cached_result = api_cache.get(cache_key)
         if cached_result:
-            return jsonify(cached_result)
+            return cacheable_json(cached_result)
 
         supabase = get_supabase_client()
         if not supabase:
             return jsonify({"success": False, "screenshots": []})
 
-        limit = int(request.args.get('limit', 12))
-
         result = community_stories_service.get_screenshots_for_homepage(limit)
 
         if result.get('success') and result.get('screenshots'):
             # Display names are now just wallet truncations (no username lookup)
             for screenshot in result['screenshots']:
                 wallet = screenshot.get('wallet_address', '')
-                screenshot['display_name'] = f"{wallet[:6]}...{wallet[-4:]}"
+                screenshot['display_name'] = _short(wallet)
 
         # Cache for 2 minutes for better performance
         api_cache.set(cache_key, result, ttl=120)
 
-        return jsonify(result)
+        return cacheable_json(result)
 
     except Exception as e:
         logger.error(f"❌ Error getting community screenshots: {e}")
@@ -621,14 +671,19 @@ def get_community_screenshots():
 def get_recent_community_stories():
     """Get recent approved community stories"""
     try:
-        from supabase_client import get_supabase_client
+
+        limit = int(request.args.get('limit', 50))
+
+        # Check cache first (1 minute TTL)
+        cache_key = f"recent_community_stories:{limit}"
+        cached_result = api_cache.get(cache_key)
+        if cached_result:
+            return cacheable_json(cached_result)
 
         supabase = get_supabase_client()
         if not supabase:
             return jsonify({"success": False, "stories": []})
 
-        limit = int(request.args.get('limit', 50))
-
         # Get approved community stories (both high and low rewards)
         stories = safe_supabase_operation(
             lambda: supabase.table('community_stories_submissions')\
@@ -637,7 +692,7 @@ def get_recent_community_stories():
                 .order('reviewed_at', desc=True)\
                 .limit(limit)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get recent community stories"
         )
 
@@ -649,7 +704,7 @@ def get_recent_community_stories():
 
                 formatted_stories.append({
                     'wallet_address': wallet,
-                    'display_name': f"{wallet[:6]}...{wallet[-4:]}",
+                    'display_name': _short(wallet),
                     'reward_amount': float(story.get('reward_amount', 0)),
                     'reviewed_at': story.get('reviewed_at'),
                     'status': story.get('status'),
@@ -657,11 +712,15 @@ def get_recent_community_stories():
                     'submission_id': story.get('submission_id')
                 })
 
-        return jsonify({
+        result = {
             "success": True,
             "stories": formatted_stories,
             "total_count": len(formatted_stories)
-        })
+        }
+
+        api_cache.set(cache_key, result, ttl=60)
+
+        return cacheable_json(result)
 
     except Exception as e:
         logger.error(f"❌ Error getting recent community stories: {e}")
@@ -671,7 +730,6 @@ def get_recent_community_stories():
 @admin_required
 def get_maintenance_status_api():
     feature = request.args.get('feature', 'wallet_connection')
-    from maintenance_service import maintenance_service
     result = maintenance_service.get_maintenance_status(feature)
     return jsonify(result)
 
@@ -682,9 +740,8 @@ def set_maintenance_status_api():
     feature_name = data.get('feature_name')
     is_maintenance = data.get('is_maintenance')
     message = data.get('message')
-    admin_wallet = session.get('wallet')
+    admin_wallet = g.wallet
     
-    from maintenance_service import maintenance_service
     result = maintenance_service.set_maintenance_status(feature_name, is_maintenance, message, admin_wallet)
     return jsonify(result)
 
@@ -693,14 +750,12 @@ def public_maintenance_status():
     feature = request.args.get('feature', 'wallet_connection')
     wallet_address = request.args.get('wallet') # Get wallet from query param for exemption check
     
-    from maintenance_service import maintenance_service
     result = maintenance_service.get_maintenance_status(feature)
     
     # Check if the specific wallet provided is an admin
     check_wallet = wallet_address or session.get('wallet')
     
     if check_wallet:
-        from supabase_client import is_admin
         if is_admin(check_wallet):
             logger.info(f"🛡️ Admin {check_wallet[:8]}... detected, bypassing maintenance for {feature}")
             result['is_maintenance'] = False
@@ -719,7 +774,7 @@ def index():
 @routes.route("/login")
 def login_page():
     """Legacy login page - redirect to homepage"""
-    return redirect(url_for("routes.index"))
+    return redirect("/")
 
 @routes.route("/login", methods=["POST"])
 def login():
@@ -728,12 +783,121 @@ def login():
     # For now, assuming it sets session['wallet'] and session['verified'] if needed
     # For the purpose of this edit, we assume session['wallet'] is set by other means if this is bypassed
     # If session['wallet'] is not set, the subsequent checks will handle redirection.
-    return redirect(url_for("routes.index"))
+    return redirect("/")
 
 @routes.route("/verify-ubi-page")
 def verify_ubi_page():
     """Legacy verify page - redirects to main page"""
-    return redirect(url_for("routes.index"))
+    return redirect("/")
+
+def _disburse_referral_rewards(referral_code, referrer_wallet, wallet_address):
+    """Pay out and record the rewards for a referral already recorded in the database (background worker)"""
+    from referral_program.blockchain import referral_blockchain_service
+
+    referral_error_message = None
+    referrer_reward_tx = None
+    referee_reward_tx = None
+
+    try:
+        # Step 3: Disburse 200 G$ to REFERRER (User A who shared the code)
+        logger.info("💰 Step 3 - Disbursing 200 G$ to REFERRER %s...", referrer_wallet[:8])
+        referrer_result = referral_blockchain_service.disburse_referral_reward_sync(
+            wallet_address=referrer_wallet,
+            amount=200.0,
+            reward_type='referrer'
+        )
+        logger.info("🔍 Referrer disbursement result: %s", referrer_result)
+
+        if referrer_result.get('success'):
+            referrer_reward_tx = referrer_result.get('tx_hash')
+            logger.info("✅ Referrer reward sent! TX: %s", referrer_reward_tx)
+        else:
+            error_msg = referrer_result.get('error', 'Unknown blockchain error')
+            logger.error("❌ Referrer reward FAILED: %s", error_msg)
+            referral_error_message = f"Referrer reward failed: {error_msg}"
+
+        # Step 4: Disburse 100 G$ to REFEREE (New user - User B)
+        logger.info("💰 Step 4 - Disbursing 100 G$ to REFEREE (new user) %s...", wallet_address[:8])
+        referee_result = referral_blockchain_service.disburse_referral_reward_sync(
+            wallet_address=wallet_address,
+            amount=100.0,
+            reward_type='referee'
+        )
+        logger.info("🔍 Referee disbursement result: %s", referee_result)
+
+        if referee_result.get('success'):
+            referee_reward_tx = referee_result.get('tx_hash')
+            logger.info("✅ Referee reward sent! TX: %s", referee_reward_tx)
+        else:
+            error_msg = referee_result.get('error', 'Unknown blockchain error')
+            logger.error("❌ Referee reward FAILED: %s", error_msg)
+            if not referral_error_message:
+                referral_error_message = f"Referee reward failed: {error_msg}"
+
+        # Step 5: Log rewards to database (one timestamp for the log rows and status update)
+        ts_iso = datetime.now(timezone.utc).isoformat()
+        supabase_client = get_supabase_client()
+        if supabase_client:
+            reward_rows = []
+            if referrer_result.get('success'):
+                reward_rows.append({
+                    'wallet_address': referrer_wallet,
+                    'reward_amount': 200.0,
+                    'reward_type': 'referrer',
+                    'referral_code': referral_code,
+                    'tx_hash': referrer_reward_tx,
+                    'created_at': ts_iso
+                })
+            if referee_result.get('success'):
+                reward_rows.append({
+                    'wallet_address': wallet_address,
+                    'reward_amount': 100.0,
+                    'reward_type': 'referee',
+                    'referral_code': referral_code,
+                    'tx_hash': referee_reward_tx,
+                    'created_at': ts_iso
+                })
+
+            # Step 6: Log the rewards and update the referral status in one call
+            both_successful = referrer_result.get('success') and referee_result.get('success')
+            status_to_set = 'completed' if both_successful else 'failed'
+            logger.info("📝 Logging %s referral reward(s) and setting status to: %s", len(reward_rows), status_to_set)
+
+            safe_supabase_operation(
+                lambda: supabase_client.rpc('finalize_referral', {
+                    'p_code': referral_code,
+                    'p_referee': wallet_address,
+                    'p_status': status_to_set,
+                    'p_error': referral_error_message,
+                    'p_completed_at': ts_iso if status_to_set == 'completed' else None,
+                    'p_rows': reward_rows
+                }).execute(),
+                fallback_result=None,
+                operation_name="finalize referral"
+            )
+
+        # Final status log
+        logger.info("🎁 ========================================")
+        if referrer_result.get('success') and referee_result.get('success'):
+            logger.info("✅ ✅ ✅ REFERRAL REWARDS FULLY SUCCESSFUL! ✅ ✅ ✅")
+            logger.info("💰 Referrer %s... received 200 G$", referrer_wallet[:8])
+            logger.info("📜 TX: %s", referrer_reward_tx)
+            logger.info("💰 Referee %s... received 100 G$", wallet_address[:8])
+            logger.info("📜 TX: %s", referee_reward_tx)
+        else:
+            logger.error("⚠️ REFERRAL REWARDS PARTIALLY FAILED")
+            if referrer_result.get('success'):
+                logger.info("✅ Referrer got reward: %s", referrer_reward_tx)
+            else:
+                logger.error("❌ Referrer reward failed")
+            if referee_result.get('success'):
+                logger.info("✅ Referee got reward: %s", referee_reward_tx)
+            else:
+                logger.error("❌ Referee reward failed")
+        logger.info("🎁 ========================================")
+
+    except Exception as ref_error:
+        logger.exception("❌ Referral reward disbursement error for code %s: %s", referral_code, ref_error)
 
 @routes.route("/verify-ubi", methods=["POST"])
 def verify_ubi():
@@ -758,167 +922,69 @@ def verify_ubi():
             session["wallet"] = wallet_address
             session["verified"] = True
 
+            # Seed the UBI check cache and session stamp so the redirect to
+            # /overview doesn't re-query the chain
+            blockchain_cache.set(cache_ubi_claim_key(wallet_address), result, ttl=UBI_CHECK_TTL)
+            session["ubi_verified_until"] = time.time() + UBI_CHECK_TTL
+
             # Extract block and amount from the latest activity
             latest_activity = result.get("summary", {}).get("latest_activity", {})
             block_number = latest_activity.get("block", "N/A")
             claim_amount = latest_activity.get("amount", "N/A")
 
             # Process referral rewards automatically (CRITICAL: This happens during UBI verification)
-            referral_recorded = False
             referral_error_message = None
-            referrer_reward_tx = None
-            referee_reward_tx = None
+            pending_referral_tx = False
 
             if referral_code and referral_code.strip():
                 try:
                     from referral_program.referral_service import referral_service
-                    from referral_program.blockchain import referral_blockchain_service
-                    from datetime import datetime
 
-                    logger.info(f"🎁 ========================================")
-                    logger.info(f"🎁 REFERRAL REWARD PROCESSING STARTED")
-                    logger.info(f"🎁 Code: {referral_code}")
-                    logger.info(f"🎁 New User (Referee): {wallet_address[:8]}...")
-                    logger.info(f"🎁 ========================================")
+                    logger.info("🎁 ========================================")
+                    logger.info("🎁 REFERRAL REWARD PROCESSING STARTED")
+                    logger.info("🎁 Code: %s", referral_code)
+                    logger.info("🎁 New User (Referee): %s...", wallet_address[:8])
+                    logger.info("🎁 ========================================")
 
                     # Step 1: Validate referral code
                     validation = referral_service.validate_referral_code(referral_code)
-                    logger.info(f"🔍 Step 1 - Validation: {validation}")
+                    logger.info("🔍 Step 1 - Validation: %s", validation)
 
                     if not validation.get('valid'):
                         error_msg = validation.get('error', 'Invalid referral code')
-                        logger.error(f"❌ FAILED: {error_msg}")
+                        logger.error("❌ FAILED: %s", error_msg)
                         raise Exception(error_msg)
 
                     referrer_wallet = validation['referrer_wallet']
-                    logger.info(f"✅ Valid code - Referrer: {referrer_wallet[:8]}...")
+                    logger.info("✅ Valid code - Referrer: %s...", referrer_wallet[:8])
 
                     # Step 2: Record the referral in database
-                    logger.info(f"📝 Step 2 - Recording referral in database...")
+                    logger.info("📝 Step 2 - Recording referral in database...")
                     record_result = referral_service.record_referral(
                         referral_code=referral_code,
                         referee_wallet=wallet_address
                     )
-                    logger.info(f"🔍 Record result: {record_result}")
+                    logger.info("🔍 Record result: %s", record_result)
 
                     if not record_result.get('success'):
                         error_msg = record_result.get('error', 'Failed to record referral')
-                        logger.error(f"❌ FAILED to record: {error_msg}")
+                        logger.error("❌ FAILED to record: %s", error_msg)
                         raise Exception(error_msg)
 
-                    referral_recorded = True
-                    logger.info(f"✅ Referral recorded in database")
-
-                    # Step 3: Disburse 200 G$ to REFERRER (User A who shared the code)
-                    logger.info(f"💰 Step 3 - Disbursing 200 G$ to REFERRER {referrer_wallet[:8]}...")
-                    referrer_result = referral_blockchain_service.disburse_referral_reward_sync(
-                        wallet_address=referrer_wallet,
-                        amount=200.0,
-                        reward_type='referrer'
-                    )
-                    logger.info(f"🔍 Referrer disbursement result: {referrer_result}")
+                    logger.info("✅ Referral recorded in database")
 
-                    if referrer_result.get('success'):
-                        referrer_reward_tx = referrer_result.get('tx_hash')
-                        logger.info(f"✅ Referrer reward sent! TX: {referrer_reward_tx}")
-                    else:
-                        error_msg = referrer_result.get('error', 'Unknown blockchain error')
-                        logger.error(f"❌ Referrer reward FAILED: {error_msg}")
-                        referral_error_message = f"Referrer reward failed: {error_msg}"
-
-                    # Step 4: Disburse 100 G$ to REFEREE (New user - User B)
-                    logger.info(f"💰 Step 4 - Disbursing 100 G$ to REFEREE (new user) {wallet_address[:8]}...")
-                    referee_result = referral_blockchain_service.disburse_referral_reward_sync(
-                        wallet_address=wallet_address,
-                        amount=100.0,
-                        reward_type='referee'
-                    )
-                    logger.info(f"🔍 Referee disbursement result: {referee_result}")
-
-                    if referee_result.get('success'):
-                        referee_reward_tx = referee_result.get('tx_hash')
-                        logger.info(f"✅ Referee reward sent! TX: {referee_reward_tx}")
-                    else:
-                        error_msg = referee_result.get('error', 'Unknown blockchain error')
-                        logger.error(f"❌ Referee reward FAILED: {error_msg}")
-                        if not referral_error_message:
-                            referral_error_message = f"Referee reward failed: {error_msg}"
-
-                    # Step 5: Log rewards to database
-                    supabase_client = get_supabase_client()
-                    if supabase_client:
-                        if referrer_result.get('success'):
-                            logger.info(f"📝 Logging referrer reward to database...")
-                            safe_supabase_operation(
-                                lambda: supabase_client.table('referral_rewards_log').insert({
-                                    'wallet_address': referrer_wallet,
-                                    'reward_amount': 200.0,
-                                    'reward_type': 'referrer',
-                                    'referral_code': referral_code,
-                                    'tx_hash': referrer_reward_tx,
-                                    'created_at': datetime.now().isoformat()
-                                }).execute(),
-                                fallback_result=None,
-                                operation_name="log referrer reward"
-                            )
-
-                        if referee_result.get('success'):
-                            logger.info(f"📝 Logging referee reward to database...")
-                            safe_supabase_operation(
-                                lambda: supabase_client.table('referral_rewards_log').insert({
-                                    'wallet_address': wallet_address,
-                                    'reward_amount': 100.0,
-                                    'reward_type': 'referee',
-                                    'referral_code': referral_code,
-                                    'tx_hash': referee_reward_tx,
-                                    'created_at': datetime.now().isoformat()
-                                }).execute(),
-                                fallback_result=None,
-                                operation_name="log referee reward"
-                            )
-
-                        # Step 6: Update referral status
-                        both_successful = referrer_result.get('success') and referee_result.get('success')
-                        status_to_set = 'completed' if both_successful else 'failed'
-                        logger.info(f"📝 Updating referral status to: {status_to_set}")
-
-                        safe_supabase_operation(
-                            lambda: supabase_client.table('referrals').update({
-                                'status': status_to_set,
-                                'completed_at': datetime.now().isoformat() if status_to_set == 'completed' else None,
-                                'error_message': referral_error_message
-                            }).eq('referral_code', referral_code).eq('referee_wallet', wallet_address).execute(),
-                            fallback_result=None,
-                            operation_name="update referral status"
-                        )
-
-                    # Final status log
-                    logger.info(f"🎁 ========================================")
-                    if referrer_result.get('success') and referee_result.get('success'):
-                        logger.info(f"✅ ✅ ✅ REFERRAL REWARDS FULLY SUCCESSFUL! ✅ ✅ ✅")
-                        logger.info(f"💰 Referrer {referrer_wallet[:8]}... received 200 G$")
-                        logger.info(f"📜 TX: {referrer_reward_tx}")
-                        logger.info(f"💰 Referee {wallet_address[:8]}... received 100 G$")
-                        logger.info(f"📜 TX: {referee_reward_tx}")
-                    else:
-                        logger.error(f"⚠️ REFERRAL REWARDS PARTIALLY FAILED")
-                        if referrer_result.get('success'):
-                            logger.info(f"✅ Referrer got reward: {referrer_reward_tx}")
-                        else:
-                            logger.error(f"❌ Referrer reward failed")
-                        if referee_result.get('success'):
-                            logger.info(f"✅ Referee got reward: {referee_reward_tx}")
-                        else:
-                            logger.error(f"❌ Referee reward failed")
-                    logger.info(f"🎁 ========================================")
+                    # Steps 3-6 (two on-chain payouts plus bookkeeping) run in the
+                    # background so the login response doesn't wait on the chain
+                    _REFERRAL_POOL.submit(_disburse_referral_rewards, referral_code, referrer_wallet, wallet_address)
+                    pending_referral_tx = True
+                    logger.info("⏳ Referral rewards queued for background disbursement")
 
                 except Exception as ref_error:
-                    logger.error(f"❌ ❌ ❌ REFERRAL PROCESSING EXCEPTION ❌ ❌ ❌")
-                    logger.error(f"❌ Error: {ref_error}")
+                    logger.error("❌ ❌ ❌ REFERRAL PROCESSING EXCEPTION ❌ ❌ ❌")
+                    logger.error("❌ Error: %s", ref_error)
                     logger.exception("Full referral error traceback:")
-                    referral_recorded = False
                     referral_error_message = str(ref_error)
-                    logger.error(f"🎁 ========================================")
+                    logger.error("🎁 ========================================")
 
             # Set permanent session
             session.permanent = True
@@ -928,6 +994,8 @@ def verify_ubi():
                 'message': 'Identity verification successful!',
                 'wallet': wallet_address,
                 'ubi_verified': True,
+                'pending_referral_tx': pending_referral_tx,
+                'referral_error': referral_error_message,
                 'redirect_to': '/overview'
             })
         else:
@@ -958,6 +1026,9 @@ def verify_ubi():
             "reason": "verification_error"
         }), 500
 
+OVERVIEW_GUEST_CACHE_KEY = "overview:guest"
+OVERVIEW_GUEST_CACHE_TTL = 60
+
 @routes.route("/overview")
 def overview():
     wallet = session.get('wallet') or session.get('wallet_address')
@@ -967,12 +1038,11 @@ def overview():
     # Check if user has valid session
     if wallet and verified:
         # Validate UBI claim is still recent for authenticated users
-        from blockchain import has_recent_ubi_claim
-        ubi_check = has_recent_ubi_claim(wallet)
+        ubi_check = check_ubi_claim(wallet)
 
         if ubi_check["status"] != "success":
             # UBI claim expired - clear session and show guest view
-            logger.warning(f"⚠️ Session expired for {wallet[:8]}... - showing guest view")
+            logger.warning("⚠️ Session expired for %s... - showing guest view", wallet[:8])
             session.clear()
             wallet = None
             verified = False
@@ -980,41 +1050,46 @@ def overview():
             # Valid session - track overview page visit
             analytics.track_page_view(wallet, "overview")
 
+    # Guest view only changes with platform stats - serve the rendered page from cache
+    is_guest = not (wallet and verified)
+    if is_guest:
+        cached_html = api_cache.get(OVERVIEW_GUEST_CACHE_KEY)
+        if cached_html is not None:
+            return cached_html
+
     # Get analytics - pass None for guest users, wallet for authenticated users
-    stats = analytics.get_dashboard_stats(wallet if wallet and verified else None)
+    stats = analytics.get_dashboard_stats(None if is_guest else wallet)
 
     # Debug logging
-    logger.info(f"🔍 Overview page - Wallet: {wallet[:8] if wallet else 'Guest'}...")
-    logger.info(f"🔍 Overview page - stats keys: {list(stats.keys())}")
-    logger.info(f"🔍 Overview page - disbursement_analytics present: {'disbursement_analytics' in stats}")
-    if 'disbursement_analytics' in stats:
-        logger.info(f"🔍 Overview page - disbursement_analytics keys: {list(stats['disbursement_analytics'].keys())}")
-        logger.info(f"🔍 Overview page - breakdown_formatted present: {'breakdown_formatted' in stats['disbursement_analytics']}")
-
-    return render_template("overview.html",
-                         wallet=wallet if wallet and verified else None,
-                         data=stats)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔍 Overview page - Wallet: %s...", wallet[:8] if wallet else 'Guest')
+        logger.debug("🔍 Overview page - stats keys: %s", list(stats.keys()))
+        logger.debug("🔍 Overview page - disbursement_analytics present: %s", 'disbursement_analytics' in stats)
+        if 'disbursement_analytics' in stats:
+            logger.debug("🔍 Overview page - disbursement_analytics keys: %s", list(stats['disbursement_analytics'].keys()))
+            logger.debug("🔍 Overview page - breakdown_formatted present: %s", 'breakdown_formatted' in stats['disbursement_analytics'])
+
+    html = render_template("overview.html",
+                           wallet=None if is_guest else wallet,
+                           data=stats)
+    if is_guest:
+        api_cache.set(OVERVIEW_GUEST_CACHE_KEY, html, ttl=OVERVIEW_GUEST_CACHE_TTL)
+    return html
 
 @routes.route("/dashboard")
+@verified_page
 def dashboard():
     """Dashboard page"""
-    wallet = session.get('wallet') or session.get('wallet_address')
-    verified = session.get('verified') or session.get('ubi_verified')
-
-    if not wallet or not verified:
-        return redirect(url_for("routes.index"))
+    wallet = g.wallet
 
     # Validate UBI claim is still recent
-    from blockchain import has_recent_ubi_claim
-    ubi_check = has_recent_ubi_claim(wallet)
+    ubi_check = check_ubi_claim(wallet)
 
     if ubi_check["status"] != "success":
         # UBI claim expired - auto logout and redirect to homepage
         logger.warning(f"⚠️ Auto-logout: UBI verification expired for {wallet[:8]}...")
         session.clear()
-        return redirect(url_for("routes.index"))
-
-
+        return redirect("/")
 
     # Track dashboard visit
     analytics.track_page_view(wallet, "dashboard")
@@ -1063,11 +1138,9 @@ def track_analytics_endpoint(): # Renamed to avoid conflict with analytics_servi
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @routes.route("/ubi-tracker")
+@verified_page
 def ubi_tracker_page():
-    if not session.get("verified") or not session.get("wallet"):
-        return redirect(url_for("routes.index"))
-
-    wallet = session.get("wallet")
+    wallet = g.wallet
 
     analytics.track_page_view(wallet, "ubi_tracker")
 
@@ -1075,6 +1148,14 @@ def ubi_tracker_page():
                          wallet=wallet,
                          contract_count=len(GOODDOLLAR_CONTRACTS))
 
+# Cookies cleared and no-cache headers sent on every logout
+LOGOUT_COOKIES = ('session', 'wallet', 'verified', 'username')
+LOGOUT_HEADERS = {
+    'Cache-Control': 'no-cache, no-store, must-revalidate, private',
+    'Pragma': 'no-cache',
+    'Expires': '0'
+}
+
 @routes.route("/logout")
 def logout():
     wallet = session.get("wallet")
@@ -1086,34 +1167,27 @@ def logout():
     session.clear()
 
     # Create response with redirect
-    response = redirect(url_for("routes.index"))
+    response = redirect("/")
 
     # Clear all session cookies
-    response.set_cookie('session', '', expires=0, path='/')
-    response.set_cookie('wallet', '', expires=0, path='/')
-    response.set_cookie('verified', '', expires=0, path='/')
-    response.set_cookie('username', '', expires=0, path='/')
+    for cookie_name in LOGOUT_COOKIES:
+        response.set_cookie(cookie_name, '', expires=0, path='/')
 
     # Add cache control headers to prevent caching
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, private'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
+    response.headers.update(LOGOUT_HEADERS)
 
     return response
 
 
 @routes.route("/news")
+@verified_page
 def news_feed_page():
-    if not session.get("verified") or not session.get("wallet"):
-        return redirect(url_for("routes.index"))
-
-    wallet = session.get("wallet")
+    wallet = g.wallet
 
     # Track news page visit
     analytics.track_page_view(wallet, "news_feed")
 
     # Get news feed data for initial page load
-    from news_feed import news_feed_service
 
     featured_news = news_feed_service.get_featured_news(limit=3)
     recent_news = news_feed_service.get_news_feed(limit=10)
@@ -1129,7 +1203,6 @@ def news_feed_page():
 @routes.route('/news/article/<article_id>')
 def news_article_page(article_id: str):
     """Individual news article page"""
-    from news_feed import news_feed_service # Import moved here to avoid circular import issues if news_feed is used elsewhere before this route is called
 
     article = news_feed_service.get_news_article(article_id)
 
@@ -1168,8 +1241,7 @@ def news_article_page(article_id: str):
 def check_admin_status():
     """Check if current user is admin"""
     try:
-        wallet = session.get("wallet")
-        from supabase_client import is_admin
+        wallet = g.wallet
 
         is_admin_user = is_admin(wallet)
 
@@ -1192,23 +1264,21 @@ def get_all_users():
             return jsonify({"success": False, "error": "Database not available"}), 500
 
         limit = int(request.args.get('limit', 100))
-        offset = int(request.args.get('offset', 0))
 
         # Get users with pagination
-        users = safe_supabase_operation(
-            lambda: supabase.table('user_data')\
-                .select('wallet_address, username, ubi_verified, total_logins, last_login, created_at')\
-                .order('created_at', desc=True)\
-                .range(offset, offset + limit - 1)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get all users"
+        users, next_cursor = paginate_newest_first(
+            supabase.table('user_data')\
+                .select('wallet_address, username, ubi_verified, total_logins, last_login, created_at'),
+            limit,
+            "get all users",
+            tiebreak='wallet_address'
         )
 
         return jsonify({
             "success": True,
-            "users": users.data if users.data else [],
-            "count": len(users.data) if users.data else 0
+            "users": users,
+            "count": len(users),
+            "next_cursor": next_cursor
         })
     except Exception as e:
         logger.error(f"❌ Get users error: {e}")
@@ -1219,7 +1289,6 @@ def get_all_users():
 def get_admin_stats():
     """Get platform statistics (admin only)"""
     try:
-        from analytics_service import analytics
 
         # Get comprehensive platform stats using the correct method
         platform_stats = analytics.get_global_analytics()
@@ -1245,7 +1314,6 @@ def get_admin_stats():
 def set_user_admin_status():
     """Set admin status for a user (admin only)"""
     try:
-        from supabase_client import set_admin_status, log_admin_action
 
         data = request.json
         target_wallet = data.get("wallet_address")
@@ -1254,11 +1322,15 @@ def set_user_admin_status():
         if not target_wallet:
             return jsonify({"success": False, "error": "Wallet address required"}), 400
 
-        admin_wallet = session.get("wallet")
+        admin_wallet = g.wallet
 
         # Set admin status
         result = set_admin_status(target_wallet, is_admin_status)
 
+        # An admin changing their own status must not keep the session shortcut
+        if target_wallet == admin_wallet:
+            session.pop("is_admin", None)
+
         if result.get("success"):
             # Log admin action
             log_admin_action(
@@ -1283,23 +1355,20 @@ def get_admin_actions_log():
             return jsonify({"success": False, "error": "Database not available"}), 500
 
         limit = int(request.args.get('limit', 50))
-        offset = int(request.args.get('offset', 0))
 
         # Get admin actions with pagination
-        actions = safe_supabase_operation(
-            lambda: supabase.table('admin_actions_log')\
-                .select('*')\
-                .order('created_at', desc=True)\
-                .range(offset, offset + limit - 1)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get admin actions log"
+        actions, next_cursor = paginate_newest_first(
+            supabase.table('admin_actions_log').select('*'),
+            limit,
+            "get admin actions log",
+            tiebreak='id'
         )
 
         return jsonify({
             "success": True,
-            "actions": actions.data if actions.data else [],
-            "count": len(actions.data) if actions.data else 0
+            "actions": actions,
+            "count": len(actions),
+            "next_cursor": next_cursor
         })
     except Exception as e:
         logger.error(f"❌ Get admin actions log error: {e}")
@@ -1310,7 +1379,6 @@ def get_admin_actions_log():
 def get_reward_config():
     """Get all reward configurations (admin only)"""
     try:
-        from reward_config_service import reward_config_service
 
         result = reward_config_service.get_all_rewards()
         return jsonify(result)
@@ -1323,12 +1391,11 @@ def get_reward_config():
 def update_reward_config():
     """Update reward configuration (admin only)"""
     try:
-        from reward_config_service import reward_config_service
 
         data = request.json
         task_type = data.get('task_type')
         new_amount = float(data.get('reward_amount', 0))
-        admin_wallet = session.get('wallet')
+        admin_wallet = g.wallet
 
         if not task_type or task_type not in ['telegram_task', 'twitter_task', 'facebook_task']:
             return jsonify({"success": False, "error": "Invalid task type"}), 400
@@ -1364,24 +1431,32 @@ def get_quiz_questions():
 
         logger.info("📚 Fetching quiz questions from Supabase 'quiz_questions' table...")
 
-        # Get all quiz questions
-        questions = safe_supabase_operation(
-            lambda: supabase.table('quiz_questions')\
-                .select('*')\
-                .order('created_at', desc=True)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get quiz questions"
-        )
+        # Only the columns the admin table and edit form use
+        query = supabase.table('quiz_questions')\
+            .select('question_id, question, answer_a, answer_b, answer_c, answer_d, correct, created_at')
+
+        # ?limit= (with ?cursor= or ?offset=) pages the list; without it the
+        # full list is returned as before
+        limit = request.args.get('limit', type=int)
+        next_cursor = None
+        if limit:
+            questions, next_cursor = paginate_newest_first(query, limit, "get quiz questions", tiebreak='question_id')
+        else:
+            questions = safe_supabase_operation(
+                lambda: query.order('created_at', desc=True).execute(),
+                fallback_result=EMPTY_RESULT,
+                operation_name="get quiz questions"
+            ).data or []
 
-        logger.info(f"✅ Retrieved {len(questions.data) if questions.data else 0} questions from Supabase")
-        if questions.data and len(questions.data) > 0:
-            logger.info(f"📝 Sample question: ID={questions.data[0].get('question_id')}, Question={questions.data[0].get('question')[:50]}...")
+        logger.info("✅ Retrieved %s questions from Supabase", len(questions))
+        if questions and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📝 Sample question: ID=%s, Question=%s...", questions[0].get('question_id'), (questions[0].get('question') or '')[:50])
 
         return jsonify({
             "success": True,
-            "questions": questions.data if questions.data else [],
-            "count": len(questions.data) if questions.data else 0,
+            "questions": questions,
+            "count": len(questions),
+            "next_cursor": next_cursor,
             "data_source": "supabase_quiz_questions_table"
         })
     except Exception as e:
@@ -1409,21 +1484,7 @@ def add_quiz_question():
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        # Check if question_id already exists
-        existing = safe_supabase_operation(
-            lambda: supabase.table('quiz_questions')\
-                .select('question_id')\
-                .eq('question_id', data['question_id'])\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="check question_id"
-        )
-
-        if existing.data and len(existing.data) > 0:
-            return jsonify({"success": False, "error": "Question ID already exists"}), 400
-
         # Add new question
-        from datetime import datetime
         question_data = {
             'question_id': data['question_id'],
             'question': data['question'],
@@ -1435,15 +1496,19 @@ def add_quiz_question():
             'created_at': datetime.utcnow().isoformat() + 'Z'
         }
 
-        result = safe_supabase_operation(
-            lambda: supabase.table('quiz_questions').insert(question_data).execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="add quiz question"
-        )
+        # question_id is UNIQUE, so the insert itself detects duplicates
+        # (no separate existence check, and no window between check and insert)
+        try:
+            result = supabase.table('quiz_questions').insert(question_data).execute()
+        except APIError as e:
+            if e.code == '23505':
+                return jsonify({"success": False, "error": "Question ID already exists"}), 400
+            logger.error(f"❌ Error in add quiz question: {e}")
+            result = EMPTY_RESULT
 
         if result.data:
             # Log admin action
-            admin_wallet = session.get("wallet")
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="add_quiz_question",
@@ -1490,13 +1555,13 @@ def update_quiz_question(question_id):
                 .update(update_data)\
                 .eq('question_id', question_id)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="update quiz question"
         )
 
         if result.data:
             # Log admin action
-            admin_wallet = session.get("wallet")
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="update_quiz_question",
@@ -1527,13 +1592,13 @@ def delete_quiz_question(question_id):
                 .delete()\
                 .eq('question_id', question_id)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="delete quiz question"
         )
 
         if result.data:
             # Log admin action
-            admin_wallet = session.get("wallet")
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="delete_quiz_question",
@@ -1558,27 +1623,22 @@ def delete_all_quiz_questions():
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        # Get count of questions before deletion
-        count_result = safe_supabase_operation(
-            lambda: supabase.table('quiz_questions').select('quiz_id').execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="count quiz questions"
+        # Delete and count in one round-trip (see create_learn_earn_tables.sql)
+        result = safe_supabase_operation(
+            lambda: supabase.rpc('delete_all_quiz_questions_rpc').execute(),
+            fallback_result=None,
+            operation_name="delete all quiz questions"
         )
+        if result is None:
+            return jsonify({"success": False, "error": "Failed to delete questions"}), 500
 
-        question_count = len(count_result.data) if count_result.data else 0
+        question_count = result.data or 0
 
         if question_count == 0:
             return jsonify({"success": False, "error": "No questions to delete"}), 400
 
-        # Delete all questions
-        result = safe_supabase_operation(
-            lambda: supabase.table('quiz_questions').delete().neq('quiz_id', 0).execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="delete all quiz questions"
-        )
-
         # Log admin action
-        admin_wallet = session.get("wallet")
+        admin_wallet = g.wallet
         log_admin_action(
             admin_wallet=admin_wallet,
             action_type="delete_all_quiz_questions",
@@ -1611,9 +1671,8 @@ def send_broadcast_message():
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        admin_wallet = session.get("wallet")
+        admin_wallet = g.wallet
 
-        from datetime import datetime
         broadcast_data = {
             'title': title,
             'message': message,
@@ -1624,7 +1683,7 @@ def send_broadcast_message():
 
         result = safe_supabase_operation(
             lambda: supabase.table('admin_broadcast_messages').insert(broadcast_data).execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="send broadcast message"
         )
 
@@ -1666,7 +1725,7 @@ def get_broadcast_messages():
                 .order('created_at', desc=True)\
                 .limit(limit)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get broadcast messages"
         )
 
@@ -1695,12 +1754,12 @@ def delete_broadcast_message(broadcast_id):
                 .update({'is_active': False})\
                 .eq('id', broadcast_id)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="deactivate broadcast message"
         )
 
         if result.data:
-            admin_wallet = session.get("wallet")
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="delete_broadcast_message",
@@ -1721,7 +1780,6 @@ def delete_broadcast_message(broadcast_id):
 def get_news_history():
     """Get all news articles (admin only)"""
     try:
-        from news_feed import news_feed_service
 
         supabase = get_supabase_client()
         if not supabase:
@@ -1733,7 +1791,7 @@ def get_news_history():
                 .select('*')\
                 .order('created_at', desc=True)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get all news articles"
         )
 
@@ -1762,13 +1820,13 @@ def delete_news_article(news_id):
                 .delete()\
                 .eq('id', news_id)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="delete news article"
         )
 
         if result.data:
             # Log admin action
-            admin_wallet = session.get('wallet')
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="delete_news_article",
@@ -1784,12 +1842,47 @@ def delete_news_article(news_id):
         logger.error(f"❌ Error deleting news article: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def _upload_news_image(article_id, title, api_key, filename, image_data, mimetype):
+    """Upload a news image to ImgBB and attach it to the article (background worker)"""
+    try:
+        logger.info(f"📤 Uploading image to ImgBB: {filename} ({len(image_data)} bytes)")
+
+        imgbb_response = requests.post(
+            'https://api.imgbb.com/1/upload',
+            params={
+                'key': api_key,
+                'name': f"news_{title[:30]}"
+            },
+            files={'image': (filename, image_data, mimetype)},
+            timeout=30
+        )
+
+        logger.info(f"📥 ImgBB Response: {imgbb_response.status_code}")
+
+        if imgbb_response.status_code != 200:
+            logger.error(f"❌ ImgBB upload failed: {imgbb_response.status_code} - {imgbb_response.text[:500]}")
+            return
+
+        imgbb_data = imgbb_response.json()
+        if not imgbb_data.get('success'):
+            error_msg = imgbb_data.get('error', {}).get('message', 'Unknown error')
+            logger.error(f"❌ ImgBB API error: {error_msg}")
+            return
+
+        image_url = imgbb_data['data']['url']
+        if news_feed_service.set_article_image(article_id, image_url):
+            logger.info(f"✅ Image uploaded to ImgBB for article {article_id}: {image_url}")
+        else:
+            logger.error(f"❌ Failed to attach image to article {article_id}")
+
+    except Exception:
+        logger.exception(f"❌ Image upload error for article {article_id}")
+
 @routes.route("/api/admin/publish-news", methods=["POST"])
 @admin_required
 def publish_news_article():
     """Publish a news article (admin only)"""
     try:
-        from news_feed import news_feed_service
 
         # Get form data
         title = request.form.get('title', '').strip()
@@ -1803,68 +1896,26 @@ def publish_news_article():
         if not title or not content:
             return jsonify({"success": False, "error": "Title and content are required"}), 400
 
-        # Handle image upload if present
-        image_url = None
+        # Read the image now - the upload stream is closed once this request ends
+        image_upload = None
         if 'image' in request.files:
             image_file = request.files['image']
             if image_file and image_file.filename:
-                # Upload to ImgBB
-                try:
-                    import requests
-                    import base64
+                imgbb_api_key = os.getenv('IMGBB_API_KEY')
+                if not imgbb_api_key:
+                    logger.warning("⚠️ IMGBB_API_KEY not configured - skipping image upload")
+                else:
+                    image_data = image_file.read()
 
-                    imgbb_api_key = os.getenv('IMGBB_API_KEY')
-                    if not imgbb_api_key:
-                        logger.warning("⚠️ IMGBB_API_KEY not configured - skipping image upload")
-                    else:
-                        # Reset file pointer to beginning and read image
-                        image_file.seek(0)
-                        image_data = image_file.read()
-
-                        # Validate image data
-                        if not image_data or len(image_data) == 0:
-                            logger.error("❌ Image file is empty")
-                            return jsonify({"success": False, "error": "Image file is empty"}), 400
-
-                        # Encode to base64
-                        encoded_image = base64.b64encode(image_data).decode('utf-8')
-
-                        logger.info(f"📤 Uploading image to ImgBB: {image_file.filename} ({len(image_data)} bytes)")
-
-                        # Upload to ImgBB
-                        imgbb_response = requests.post(
-                            'https://api.imgbb.com/1/upload',
-                            data={
-                                'key': imgbb_api_key,
-                                'image': encoded_image,
-                                'name': f"news_{title[:30]}"
-                            },
-                            timeout=30
-                        )
-
-                        logger.info(f"📥 ImgBB Response: {imgbb_response.status_code}")
-
-                        if imgbb_response.status_code == 200:
-                            imgbb_data = imgbb_response.json()
-                            if imgbb_data.get('success'):
-                                image_url = imgbb_data['data']['url']
-                                logger.info(f"✅ Image uploaded to ImgBB: {image_url}")
-                            else:
-                                error_msg = imgbb_data.get('error', {}).get('message', 'Unknown error')
-                                logger.error(f"❌ ImgBB API error: {error_msg}")
-                                return jsonify({"success": False, "error": f"Image upload failed: {error_msg}"}), 500
-                        else:
-                            logger.error(f"❌ ImgBB upload failed: {imgbb_response.status_code} - {imgbb_response.text[:500]}")
-                            return jsonify({"success": False, "error": f"Image upload failed with status {imgbb_response.status_code}"}), 500
-
-                except Exception as img_error:
-                    logger.error(f"❌ Image upload error: {img_error}")
-                    import traceback
-                    logger.error(f"Traceback: {traceback.format_exc()}")
-                    return jsonify({"success": False, "error": f"Image upload error: {str(img_error)}"}), 500
+                    # Validate image data
+                    if not image_data:
+                        logger.error("❌ Image file is empty")
+                        return jsonify({"success": False, "error": "Image file is empty"}), 400
+
+                    image_upload = (imgbb_api_key, image_file.filename, image_data, image_file.mimetype)
 
         # Get admin wallet
-        admin_wallet = session.get("wallet")
+        admin_wallet = g.wallet
 
         # Add news article
         result = news_feed_service.add_news_article(
@@ -1874,11 +1925,14 @@ def publish_news_article():
             priority=priority,
             author=f"Admin ({admin_wallet[:8]}...)",
             featured=featured,
-            image_url=image_url,
+            image_url=None,
             url=url if url else None
         )
 
         if result.get('success'):
+            if image_upload:
+                _UPLOAD_POOL.submit(_upload_news_image, result['article'].get('id'), title, *image_upload)
+
             # Log admin action
             log_admin_action(
                 admin_wallet=admin_wallet,
@@ -1887,7 +1941,7 @@ def publish_news_article():
                     "title": title,
                     "category": category,
                     "featured": featured,
-                    "has_image": bool(image_url)
+                    "has_image": bool(image_upload)
                 }
             )
 
@@ -1895,7 +1949,8 @@ def publish_news_article():
             return jsonify({
                 "success": True,
                 "message": "News article published successfully!",
-                "article": result.get('article')
+                "article": result.get('article'),
+                "image_pending": bool(image_upload)
             })
         else:
             return jsonify({
@@ -1904,9 +1959,7 @@ def publish_news_article():
             }), 500
 
     except Exception as e:
-        logger.error(f"❌ Publish news article error: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Publish news article error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 @routes.route("/api/admin/maintenance/learn-earn", methods=["GET"])
@@ -1914,7 +1967,6 @@ def publish_news_article():
 def get_learn_earn_maintenance():
     """Get Learn & Earn maintenance status"""
     try:
-        from maintenance_service import maintenance_service
 
         status = maintenance_service.get_maintenance_status('learn_earn')
         return jsonify(status)
@@ -1927,12 +1979,11 @@ def get_learn_earn_maintenance():
 def set_learn_earn_maintenance():
     """Set Learn & Earn maintenance status"""
     try:
-        from maintenance_service import maintenance_service
 
         data = request.json
         is_maintenance = data.get('is_maintenance', False)
         message = data.get('message', '')
-        admin_wallet = session.get('wallet')
+        admin_wallet = g.wallet
 
         if is_maintenance and not message:
             return jsonify({
@@ -1957,7 +2008,6 @@ def set_learn_earn_maintenance():
 def get_minigames_maintenance():
     """Get Minigames maintenance status"""
     try:
-        from maintenance_service import maintenance_service
 
         status = maintenance_service.get_maintenance_status('minigames')
         return jsonify(status)
@@ -1970,12 +2020,11 @@ def get_minigames_maintenance():
 def set_minigames_maintenance():
     """Set Minigames maintenance status"""
     try:
-        from maintenance_service import maintenance_service
 
         data = request.json
         is_maintenance = data.get('is_maintenance', False)
         message = data.get('message', '')
-        admin_wallet = session.get('wallet')
+        admin_wallet = g.wallet
 
         if is_maintenance and not message:
             return jsonify({
@@ -2000,7 +2049,6 @@ def set_minigames_maintenance():
 def get_quiz_settings():
     """Get current quiz settings"""
     try:
-        from learn_and_earn.learn_and_earn import quiz_manager
 
         settings = quiz_manager.get_quiz_settings()
         return jsonify({
@@ -2016,7 +2064,6 @@ def get_quiz_settings():
 def get_community_stories_settings():
     """Get Community Stories settings (admin only)"""
     try:
-        from community_stories.community_stories_service import community_stories_service
 
         config = community_stories_service.get_config()
 
@@ -2030,7 +2077,7 @@ def get_community_stories_settings():
                     .select('custom_message')\
                     .eq('feature_name', 'community_stories_message')\
                     .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
+                fallback_result=EMPTY_RESULT,
                 operation_name="get community stories message"
             )
 
@@ -2102,68 +2149,28 @@ def update_community_stories_settings():
             'custom_message': settings_json  # Store JSON in text field
         }
 
-        # Check if exists
-        existing = safe_supabase_operation(
-            lambda: supabase.table('maintenance_settings')\
-                .select('id')\
-                .eq('feature_name', 'community_stories_config')\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="check community stories config"
-        )
-
-        if existing.data and len(existing.data) > 0:
-            result = safe_supabase_operation(
-                lambda: supabase.table('maintenance_settings')\
-                    .update(settings_data)\
-                    .eq('feature_name', 'community_stories_config')\
-                    .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
-                operation_name="update community stories config"
-            )
-        else:
-            result = safe_supabase_operation(
-                lambda: supabase.table('maintenance_settings').insert(settings_data).execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
-                operation_name="insert community stories config"
-            )
+        rows = [settings_data]
 
         # Store message separately
         if message:
-            message_data = {
+            rows.append({
                 'feature_name': 'community_stories_message',
                 'is_maintenance': False,  # Use boolean field properly
                 'custom_message': message  # Store message in text field
-            }
-
-            existing_msg = safe_supabase_operation(
-                lambda: supabase.table('maintenance_settings')\
-                    .select('id')\
-                    .eq('feature_name', 'community_stories_message')\
-                    .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
-                operation_name="check community stories message"
-            )
+            })
 
-            if existing_msg.data and len(existing_msg.data) > 0:
-                safe_supabase_operation(
-                    lambda: supabase.table('maintenance_settings')\
-                        .update(message_data)\
-                        .eq('feature_name', 'community_stories_message')\
-                        .execute(),
-                    fallback_result=type('obj', (object,), {'data': []})(),
-                    operation_name="update community stories message"
-                )
-            else:
-                safe_supabase_operation(
-                    lambda: supabase.table('maintenance_settings').insert(message_data).execute(),
-                    fallback_result=type('obj', (object,), {'data': []})(),
-                    operation_name="insert community stories message"
-                )
+        # Config and message rows are written in one bulk upsert
+        result = safe_supabase_operation(
+            lambda: supabase.table('maintenance_settings')\
+                .upsert(rows, on_conflict='feature_name')\
+                .execute(),
+            fallback_result=EMPTY_RESULT,
+            operation_name="upsert community stories settings"
+        )
 
         if result.data:
             # Log admin action
-            admin_wallet = session.get('wallet')
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="update_community_stories_settings",
@@ -2200,7 +2207,7 @@ def get_insufficient_balance_message():
                 .select('custom_message')\
                 .eq('feature_name', 'learn_earn_insufficient_balance')\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get insufficient balance message"
         )
 
@@ -2234,43 +2241,19 @@ def update_insufficient_balance_message():
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        # Check if record exists
-        existing = safe_supabase_operation(
-            lambda: supabase.table('maintenance_settings')\
-                .select('id')\
-                .eq('feature_name', 'learn_earn_insufficient_balance')\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="check existing message"
+        result = safe_supabase_operation(
+            lambda: supabase.table('maintenance_settings').upsert({
+                'feature_name': 'learn_earn_insufficient_balance',
+                'is_maintenance': False,
+                'custom_message': message
+            }, on_conflict='feature_name').execute(),
+            fallback_result=EMPTY_RESULT,
+            operation_name="upsert insufficient balance message"
         )
 
-        if existing.data and len(existing.data) > 0:
-            # Update existing record
-            result = safe_supabase_operation(
-                lambda: supabase.table('maintenance_settings')\
-                    .update({'custom_message': message})\
-                    .eq('feature_name', 'learn_earn_insufficient_balance')\
-                    .execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
-                operation_name="update insufficient balance message"
-            )
-        else:
-            # Insert new record
-            from datetime import datetime
-            result = safe_supabase_operation(
-                lambda: supabase.table('maintenance_settings').insert({
-                    'feature_name': 'learn_earn_insufficient_balance',
-                    'is_maintenance': False,
-                    'custom_message': message,
-                    'created_at': datetime.utcnow().isoformat()
-                }).execute(),
-                fallback_result=type('obj', (object,), {'data': []})(),
-                operation_name="insert insufficient balance message"
-            )
-
         if result.data:
             # Log admin action
-            admin_wallet = session.get('wallet')
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="update_insufficient_balance_message",
@@ -2291,7 +2274,6 @@ def update_insufficient_balance_message():
 def update_quiz_settings():
     """Update quiz settings"""
     try:
-        from learn_and_earn.learn_and_earn import quiz_manager
 
         data = request.json
         questions_per_quiz = data.get('questions_per_quiz')
@@ -2325,7 +2307,7 @@ def update_quiz_settings():
 
         if result.get('success'):
             # Log admin action
-            admin_wallet = session.get('wallet')
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="update_quiz_settings",
@@ -2355,26 +2337,24 @@ def check_referral_status(referral_code):
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        referrals = safe_supabase_operation(
-            lambda: supabase.table('referrals').select('*').eq('referral_code', referral_code).execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get referrals by code"
-        )
-
-        rewards = safe_supabase_operation(
-            lambda: supabase.table('referral_rewards_log').select('*').eq('referral_code', referral_code).execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get rewards by code"
+        # Referrals and rewards in one round-trip (see create_referral_functions.sql)
+        activity = safe_supabase_operation(
+            lambda: supabase.rpc('get_referral_activity', {'p_code': referral_code}).execute(),
+            fallback_result=None,
+            operation_name="get referral activity by code"
         )
+        activity = (activity.data if activity else None) or {}
+        referrals = activity.get('referrals') or []
+        rewards = activity.get('rewards') or []
 
         return jsonify({
             "success": True,
             "referral_code": referral_code,
             "validation": validation,
-            "referrals": referrals.data if referrals.data else [],
-            "rewards": rewards.data if rewards.data else [],
-            "total_referrals": len(referrals.data) if referrals.data else 0,
-            "total_rewards": len(rewards.data) if rewards.data else 0
+            "referrals": referrals,
+            "rewards": rewards,
+            "total_referrals": len(referrals),
+            "total_rewards": len(rewards)
         })
     except Exception as e:
         logger.error(f"❌ Error checking referral status: {e}")
@@ -2389,60 +2369,21 @@ def get_pending_daily_tasks():
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        # Get pending Telegram tasks
-        telegram_pending = safe_supabase_operation(
-            lambda: supabase.table('telegram_task_log')\
-                .select('*')\
-                .eq('status', 'pending')\
-                .order('created_at', desc=False)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get pending telegram tasks"
-        )
-
-        # Get pending Twitter tasks
-        twitter_pending = safe_supabase_operation(
-            lambda: supabase.table('twitter_task_log')\
-                .select('*')\
-                .eq('status', 'pending')\
-                .order('created_at', desc=False)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get pending twitter tasks"
-        )
-
-        # Get pending Telegram tasks
-        telegram_pending = safe_supabase_operation(
-            lambda: supabase.table('telegram_task_log')\
-                .select('*')\
-                .eq('status', 'pending')\
-                .order('created_at', desc=False)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get pending telegram tasks"
-        )
-
-        # Get pending Twitter tasks
-        twitter_pending = safe_supabase_operation(
-            lambda: supabase.table('twitter_task_log')\
-                .select('*')\
-                .eq('status', 'pending')\
-                .order('created_at', desc=False)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get pending twitter tasks"
-        )
-
-        # Get pending Facebook tasks
-        facebook_pending = safe_supabase_operation(
-            lambda: supabase.table('facebook_task_log')\
-                .select('*')\
-                .eq('status', 'pending')\
-                .order('created_at', desc=False)\
-                .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
-            operation_name="get pending facebook tasks"
-        )
+        # The three task logs are independent: query them side by side
+        futures = [
+            _IO_POOL.submit(
+                safe_supabase_operation,
+                lambda table=table: supabase.table(table)\
+                    .select('*')\
+                    .eq('status', 'pending')\
+                    .order('created_at', desc=False)\
+                    .execute(),
+                fallback_result=EMPTY_RESULT,
+                operation_name=f"get pending {table}"
+            )
+            for table in ('telegram_task_log', 'twitter_task_log', 'facebook_task_log')
+        ]
+        telegram_pending, twitter_pending, facebook_pending = (f.result(timeout=30) for f in futures)
 
         telegram_tasks = []
         if telegram_pending.data:
@@ -2501,29 +2442,25 @@ def approve_daily_task():
         data = request.json
         submission_id = data.get('submission_id')
         platform = data.get('platform')  # 'telegram' or 'twitter' or 'facebook'
-        admin_wallet = session.get('wallet')
+        admin_wallet = g.wallet
 
         if not submission_id or not platform:
             return jsonify({"success": False, "error": "Missing required fields"}), 400
 
-        import asyncio
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
         try:
             result = None
             if platform == 'telegram':
-                from telegram_task.telegram_task import telegram_task_service
                 result = loop.run_until_complete(
                     telegram_task_service.approve_submission(submission_id, admin_wallet)
                 )
             elif platform == 'twitter':
-                from twitter_task.twitter_task import twitter_task_service
                 result = loop.run_until_complete(
                     twitter_task_service.approve_submission(submission_id, admin_wallet)
                 )
             elif platform == 'facebook':
-                from facebook_task.facebook_task import facebook_task_service
                 result = loop.run_until_complete(
                     facebook_task_service.approve_submission(submission_id, admin_wallet)
                 )
@@ -2543,9 +2480,7 @@ def approve_daily_task():
             loop.close()
 
     except Exception as e:
-        logger.error(f"❌ Error approving task: {e}")
-        import traceback
-        logger.error(f"🔍 Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Error approving task: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 @routes.route("/api/admin/daily-tasks/reject", methods=["POST"])
@@ -2557,29 +2492,25 @@ def reject_daily_task():
         submission_id = data.get('submission_id')
         platform = data.get('platform')  # 'telegram' or 'twitter' or 'facebook'
         reason = data.get('reason', '')
-        admin_wallet = session.get('wallet')
+        admin_wallet = g.wallet
 
         if not submission_id or not platform:
             return jsonify({"success": False, "error": "Missing required fields"}), 400
 
-        import asyncio
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
         try:
             result = None
             if platform == 'telegram':
-                from telegram_task.telegram_task import telegram_task_service
                 result = loop.run_until_complete(
                     telegram_task_service.reject_submission(submission_id, admin_wallet, reason)
                 )
             elif platform == 'twitter':
-                from twitter_task.twitter_task import twitter_task_service
                 result = loop.run_until_complete(
                     twitter_task_service.reject_submission(submission_id, admin_wallet, reason)
                 )
             elif platform == 'facebook':
-                from facebook_task.facebook_task import facebook_task_service
                 result = loop.run_until_complete(
                     facebook_task_service.reject_submission(submission_id, admin_wallet, reason)
                 )
@@ -2599,9 +2530,7 @@ def reject_daily_task():
             loop.close()
 
     except Exception as e:
-        logger.error(f"❌ Error rejecting task: {e}")
-        import traceback
-        logger.error(f"🔍 Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Error rejecting task: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 @routes.route("/api/admin/quiz-questions/upload", methods=["POST"])
@@ -2720,7 +2649,7 @@ CORRECT: B
         error_count = 0
         error_details = []
 
-        admin_wallet = session.get("wallet")
+        admin_wallet = g.wallet
 
         for q in questions:
             try:
@@ -2730,7 +2659,7 @@ CORRECT: B
                         .select('question_id')\
                         .eq('question_id', q['question_id'])\
                         .execute(),
-                    fallback_result=type('obj', (object,), {'data': []})(),
+                    fallback_result=EMPTY_RESULT,
                     operation_name="check question exists"
                 )
 
@@ -2740,13 +2669,12 @@ CORRECT: B
                     continue
 
                 # Add created_at timestamp
-                from datetime import datetime
                 q['created_at'] = datetime.utcnow().isoformat() + 'Z'
 
                 # Insert question
                 result = safe_supabase_operation(
                     lambda: supabase.table('quiz_questions').insert(q).execute(),
-                    fallback_result=type('obj', (object,), {'data': []})(),
+                    fallback_result=EMPTY_RESULT,
                     operation_name="insert question from file"
                 )
 
@@ -2804,7 +2732,7 @@ def get_module_links():
                 .select('*')\
                 .order('display_order', desc=False)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get module links"
         )
 
@@ -2837,8 +2765,6 @@ def add_module_link():
         if url and not content:
             logger.info(f"🔍 🤖 AUTO-SCRAPING ENABLED - Fetching content from URL: {url}")
             try:
-                import requests
-                from bs4 import BeautifulSoup
 
                 # Fetch webpage with comprehensive headers to avoid bot detection
                 logger.info(f"📥 Downloading webpage...")
@@ -2920,9 +2846,7 @@ def add_module_link():
                     logger.warning(f"⚠️ Could not find main content in {url}")
 
             except Exception as scrape_error:
-                logger.error(f"❌ Auto-scrape error: {scrape_error}")
-                import traceback
-                logger.error(f"🔍 Traceback: {traceback.format_exc()}")
+                logger.exception(f"❌ Auto-scrape error: {scrape_error}")
 
                 # Provide helpful error message
                 error_msg = str(scrape_error)
@@ -2948,7 +2872,6 @@ def add_module_link():
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        from datetime import datetime
         link_data = {
             'title': title,
             'url': url,
@@ -2963,12 +2886,12 @@ def add_module_link():
 
         result = safe_supabase_operation(
             lambda: supabase.table('learn_earn_module_links').insert(link_data).execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="add module link"
         )
 
         if result.data:
-            admin_wallet = session.get('wallet')
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="add_module_link",
@@ -2998,12 +2921,12 @@ def delete_module_link(link_id):
                 .delete()\
                 .eq('id', link_id)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="delete module link"
         )
 
         if result.data:
-            admin_wallet = session.get('wallet')
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="delete_module_link",
@@ -3023,9 +2946,8 @@ def delete_module_link(link_id):
 @auth_required
 def admin_dashboard():
     """Admin dashboard page"""
-    wallet = session.get("wallet")
+    wallet = g.wallet
 
-    from supabase_client import is_admin
     if not is_admin(wallet):
         logger.warning(f"⚠️ Non-admin access attempt from {wallet[:8]}...")
         return redirect("/dashboard")
@@ -3044,7 +2966,7 @@ def admin_dashboard():
 @routes.route("/learn-earn")
 def learn_earn_page():
     if not session.get("verified") or not session.get("wallet"):
-        return redirect(url_for("routes.index"))
+        return redirect("/")
 
     wallet = session.get("wallet")
 
@@ -3088,7 +3010,7 @@ def get_p2p_history_api():
 def get_admin_notifications():
     """Get pending submissions for admin"""
     try:
-        wallet = session.get("wallet")
+        wallet = g.wallet
 
         supabase = get_supabase_client()
         if not supabase:
@@ -3101,7 +3023,7 @@ def get_admin_notifications():
                 .eq('status', 'pending')\
                 .order('submitted_at', desc=True)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get pending community stories"
         )
 
@@ -3129,7 +3051,6 @@ def get_admin_notifications():
 def upload_developer_profile():
     """Upload developer profile image (admin only) - supports multiple profiles"""
     try:
-        from object_storage_client import upload_to_imgbb
 
         if 'image' not in request.files:
             return jsonify({"success": False, "error": "No image file provided"}), 400
@@ -3154,7 +3075,6 @@ def upload_developer_profile():
         if not supabase:
             return jsonify({"success": False, "error": "Database not available"}), 500
 
-        from datetime import datetime
         profile_data = {
             'name': name,
             'position': position,
@@ -3166,12 +3086,12 @@ def upload_developer_profile():
         # Always insert new profile (allows multiple developers)
         result = safe_supabase_operation(
             lambda: supabase.table('developer_profile').insert(profile_data).execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="insert developer profile"
         )
 
         if result.data:
-            admin_wallet = session.get('wallet')
+            admin_wallet = g.wallet
             log_admin_action(
                 admin_wallet=admin_wallet,
                 action_type="upload_developer_profile",
@@ -3184,9 +3104,7 @@ def upload_developer_profile():
             return jsonify({"success": False, "error": "Failed to save profile"}), 500
 
     except Exception as e:
-        logger.error(f"❌ Upload developer profile error: {e}")
-        import traceback
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception(f"❌ Upload developer profile error: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 @routes.route("/api/developer-profile", methods=["GET"])
@@ -3203,7 +3121,7 @@ def get_developer_profile():
                 .eq('is_active', True)\
                 .order('created_at', desc=False)\
                 .execute(),
-            fallback_result=type('obj', (object,), {'data': []})(),
+            fallback_result=EMPTY_RESULT,
             operation_name="get developer profiles"
         )
 
@@ -5,6 +5,8 @@ from supabase import create_client, Client
 from datetime import datetime
 import json
 from functools import wraps
+from types import SimpleNamespace
+from cache_utils import supabase_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,6 +20,10 @@ SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY")
 supabase: Client = None
 supabase_enabled = False
 
+# Seconds to wait after a failed initialization before get_supabase_client() retries
+INIT_RETRY_COOLDOWN = 30
+_last_init_failure = 0.0
+
 def retry_on_connection_error(max_retries=3, delay=1):
     """Decorator to retry database operations on connection errors"""
     def decorator(func):
@@ -50,8 +56,19 @@ def retry_on_connection_error(max_retries=3, delay=1):
     return decorator
 
 def get_supabase_client():
-    """Get Supabase client instance with retry logic for initialization"""
-    global supabase, supabase_enabled
+    """Get the shared Supabase client instance, initializing it with retry logic on first use
+
+    The client keeps one keep-alive HTTP session for PostgREST, so reusing it across
+    callers avoids a fresh TCP/TLS handshake (and a test query) per caller.
+    """
+    global supabase, supabase_enabled, _last_init_failure
+
+    if supabase is not None and supabase_enabled:
+        return supabase
+
+    # After a failed initialization, don't stall every caller on fresh retries
+    if time.time() - _last_init_failure < INIT_RETRY_COOLDOWN:
+        return None
 
     if not SUPABASE_URL or not SUPABASE_KEY or SUPABASE_URL == "your-supabase-url":
         logger.error("❌ SUPABASE NOT CONFIGURED!")
@@ -77,6 +94,7 @@ def get_supabase_client():
             else:
                 logger.error("💡 Check your Supabase URL and API key in environment variables")
                 supabase_enabled = False
+                _last_init_failure = time.time()
                 return None
     return None # Should not be reached if logic is sound
 
@@ -633,6 +651,68 @@ class SupabaseLogger:
 
         return result
 
+    def log_page_views_bulk(self, page_views: list):
+        """Log many (wallet_address, page, page_data) page views with one insert
+
+        Each row keeps the view time from page_data["timestamp"]. A failed
+        insert is retried once, then falls back to per-row inserts so one bad
+        row doesn't drop the batch. Each wallet's total_page_views is bumped
+        atomically by its number of views (bump_page_views RPC).
+        """
+        if not self.enabled or not page_views:
+            return None
+
+        try:
+            view_counts = {}
+            for wallet_address, _, _ in page_views:
+                view_counts[wallet_address] = view_counts.get(wallet_address, 0) + 1
+
+            # Ensure every wallet exists in user_data (user_sessions references it)
+            existing = self.client.table("user_data")\
+                .select("wallet_address")\
+                .in_("wallet_address", list(view_counts))\
+                .execute()
+            known_wallets = {row["wallet_address"] for row in (existing.data or [])}
+            for wallet_address in view_counts.keys() - known_wallets:
+                self.create_or_update_user(wallet_address)
+
+            flushed_at = datetime.now().isoformat()
+            rows = [{
+                "wallet_address": wallet_address,
+                "activity_type": "page_view",
+                "page": page,
+                "details": {"page_accessed": page},
+                "timestamp": (page_data or {}).get("timestamp") or flushed_at
+            } for wallet_address, page, page_data in page_views]
+
+            result = None
+            for attempt in range(2):
+                try:
+                    result = self.client.table("user_sessions").insert(rows).execute()
+                    break
+                except Exception as e:
+                    logger.warning(f"⚠️ Page view batch insert failed (attempt {attempt + 1}): {e}")
+
+            if result is None:
+                # Salvage what we can one row at a time
+                saved = 0
+                for row in rows:
+                    try:
+                        self.client.table("user_sessions").insert(row).execute()
+                        saved += 1
+                    except Exception as e:
+                        logger.error(f"❌ Error logging page view for {row['wallet_address'][:8]}...: {e}")
+                logger.info(f"✅ Logged {saved}/{len(rows)} page views row by row")
+
+            self.client.rpc("bump_page_views", {"p_counts": view_counts}).execute()
+
+            logger.info(f"✅ Logged {len(page_views)} page views for {len(view_counts)} wallets")
+            return result
+
+        except Exception as e:
+            logger.error(f"❌ Error logging page views: {e}")
+            return None
+
     def log_logout(self, wallet_address: str, session_data: dict = None):
         """Log user logout"""
         return self.log_activity(
@@ -684,6 +764,47 @@ class SupabaseLogger:
             logger.error(f"❌ Error getting user stats: {e}")
             return {}
 
+    def get_usernames_bulk(self, wallet_addresses: list) -> dict:
+        """Map wallet address -> username for many wallets with a single query"""
+        wallets = {w for w in wallet_addresses if w}
+        if not self.enabled or not wallets:
+            return {}
+
+        # Usernames are cached for 5 minutes; wallets without one are cached
+        # as "" so they aren't looked up again on every request
+        usernames = {}
+        missing = []
+        for wallet in wallets:
+            cached_name = supabase_cache.get(f"username:{wallet}")
+            if cached_name is None:
+                missing.append(wallet)
+            elif cached_name:
+                usernames[wallet] = cached_name
+
+        if not missing:
+            return usernames
+
+        try:
+            result = self.client.table("user_data")\
+                .select("wallet_address, username")\
+                .in_("wallet_address", missing)\
+                .execute()
+
+            found = {row["wallet_address"]: row["username"] for row in (result.data or []) if row.get("username")}
+            for wallet in missing:
+                supabase_cache.set(f"username:{wallet}", found.get(wallet, ""), ttl=300)
+
+            usernames.update(found)
+            return usernames
+
+        except Exception as e:
+            logger.error(f"❌ Error getting usernames: {e}")
+            return {}
+
+    def get_username(self, wallet_address: str):
+        """Get the username set for a wallet (None if not set)"""
+        return self.get_usernames_bulk([wallet_address]).get(wallet_address)
+
     def get_analytics_summary(self):
         """Get comprehensive analytics summary from Supabase data"""
         try:
@@ -808,6 +929,9 @@ class SupabaseLogger:
             logger.error(f"❌ Error fetching Learn & Earn earnings for {masked_wallet}: {e}")
             return 0.0
 
+# Shared empty-result fallback for safe_supabase_operation - treat as read-only
+EMPTY_RESULT = SimpleNamespace(data=[])
+
 def safe_supabase_operation(operation, fallback_result=None, operation_name="database operation"):
     """
     Safely execute a Supabase operation with error handling
@@ -826,23 +950,6 @@ def safe_supabase_operation(operation, fallback_result=None, operation_name="dat
         logger.error(f"❌ Error in {operation_name}: {e}")
         return fallback_result
 
-def get_supabase_client(retries=3):
-    """Get Supabase client instance with retry logic"""
-    global supabase_enabled
-    if supabase_enabled and supabase:
-        return supabase
-
-    # If client failed to initialize, try to reconnect
-    if retries > 0 and SUPABASE_URL and SUPABASE_KEY:
-        try:
-            time.sleep(1)  # Brief delay before retry
-            # Re-initialize the client
-            return get_supabase_client(retries - 1)
-        except:
-            pass
-
-    return None
-
 def log_admin_action(admin_wallet: str, action_type: str, action_details: dict = None, target_wallet: str = None):
     """Log admin actions to database"""
     try:
@@ -865,7 +972,12 @@ def log_admin_action(admin_wallet: str, action_type: str, action_details: dict =
         logger.error(f"❌ Error logging admin action: {e}")
 
 def is_admin(wallet_address: str) -> bool:
-    """Check if wallet address is an admin"""
+    """Check if wallet address is an admin (cached for 2 minutes)"""
+    cache_key = f"is_admin:{wallet_address}"
+    cached_status = supabase_cache.get(cache_key)
+    if cached_status is not None:
+        return cached_status
+
     try:
         supabase = get_supabase_client()
         if not supabase:
@@ -876,10 +988,9 @@ def is_admin(wallet_address: str) -> bool:
             .eq('wallet_address', wallet_address)\
             .execute()
 
-        if result.data and len(result.data) > 0:
-            return result.data[0].get('is_admin', False)
-
-        return False
+        admin_status = bool(result.data and result.data[0].get('is_admin'))
+        supabase_cache.set(cache_key, admin_status, ttl=120)
+        return admin_status
     except Exception as e:
         logger.error(f"❌ Error checking admin status: {e}")
         return False
@@ -896,6 +1007,8 @@ def set_admin_status(wallet_address: str, is_admin_status: bool) -> dict:
             .eq('wallet_address', wallet_address)\
             .execute()
 
+        supabase_cache.delete(f"is_admin:{wallet_address}")
+
         if result.data:
             logger.info(f"✅ Admin status set for {wallet_address[:8]}...: {is_admin_status}")
             return {"success": True}
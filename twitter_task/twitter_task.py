@@ -2,7 +2,7 @@ import os
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
-from supabase_client import get_supabase_client
+from supabase_client import get_supabase_client, EMPTY_RESULT
 
 logger = logging.getLogger(__name__)
 
@@ -354,7 +354,7 @@ class TwitterTaskService:
                         lambda: self.supabase.table('twitter_task_log')\
                             .select('wallet_address, created_at, twitter_url, status')\
                             .execute(),
-                        fallback_result=type('obj', (object,), {'data': []})(),
+                        fallback_result=EMPTY_RESULT,
                         operation_name="check twitter URL uniqueness"
                     )
 